@@ -7,10 +7,74 @@ import json
 from pathlib import Path
 from tqdm import tqdm
 import multiprocessing as mp
-from functools import partial
-from core.fitting import fit_rap_curve
+from core.fitting import fit_rap_curve, warm_up_worker
 from core.universal_loader import load_dataset
 
+# Recycle workers periodically so scipy/numba caches can't grow RSS unbounded
+MAX_TASKS_PER_CHILD = 200
+
+# Curves per IPC message; fits take milliseconds, so single-curve tasks are pickling-bound
+TASK_CHUNK_SIZE = 32
+
+# Time axis slices keyed by curve length, set once per worker process by _init_worker
+_TIME_SLICES = None
+
+# Column order of a successful fit_rap_curve(return_extra=False) result; failed fits
+# only fill curve/success/error, so batches are reindexed to keep CSV rows aligned
+RESULT_COLUMNS = [
+    'curve', 'success', 'error', 'P0', 'r', 'd', 'K', 'sim_rap', 'sse_rap',
+    'sim_logistic', 'sse_logistic', 'rap_better', 'final_util', 'distance',
+    'converged', 'stable_points', 'tight_stable_points_85',
+]
+
+
+def available_cpus():
+    """CPUs this process may actually use.
+    
+    Honors the scheduler affinity mask and a cgroup v2 CPU quota, so
+    containers and pinned CI runners aren't oversubscribed the way
+    os.cpu_count() (the host total) would.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        n_cpus = len(os.sched_getaffinity(0))
+    else:
+        n_cpus = os.cpu_count() or 1
+    
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            n_cpus = min(n_cpus, max(1, -(-int(quota) // int(period))))
+    except (OSError, ValueError):
+        pass
+    
+    return n_cpus
+
+
+def default_n_workers():
+    """Default pool size: one core left free for the parent process."""
+    return max(1, available_cpus() - 1)
+
+
+def _init_worker(time_slices):
+    global _TIME_SLICES
+    _TIME_SLICES = time_slices
+    
+    # Load the fit kernels now so the first real task doesn't pay for it
+    warm_up_worker()
+
+
+def _init_pool_worker(time_slices):
+    """Pool initializer: _init_worker plus a one-thread BLAS cap for this worker only."""
+    # Pin BLAS to one thread even if numpy was imported before the env vars applied
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(1)
+    except ImportError:
+        pass
+    
+    _init_worker(time_slices)
+
 class AutomatedRAPProcessor:
     def __init__(self, output_dir='results/automated', checkpoint_interval=100):
         self.output_dir = output_dir
@@ -35,64 +99,132 @@ class AutomatedRAPProcessor:
         if max_curves:
             curves = curves[:max_curves]
         
+        # checkpoint.json holds run metadata; completed curve IDs are appended
+        # to checkpoint.jsonl so each batch writes only its own IDs
         checkpoint_path = os.path.join(dataset_dir, 'checkpoint.json')
+        completed_path = os.path.join(dataset_dir, 'checkpoint.jsonl')
         if resume and os.path.exists(checkpoint_path):
             with open(checkpoint_path, 'r') as f:
                 checkpoint = json.load(f)
             completed = set(checkpoint.get('completed_curves', []))
+            if os.path.exists(completed_path):
+                with open(completed_path, 'r') as f:
+                    completed.update(json.loads(line) for line in f if line.strip())
             curves_to_process = [c for c in curves if c not in completed]
             print(f"♻️  Resuming: {len(completed)} done, {len(curves_to_process)} remaining")
         else:
             completed = set()
             curves_to_process = curves
-            checkpoint = {'dataset_id': dataset_id, 'started': timestamp, 'completed_curves': []}
+            checkpoint = {'dataset_id': dataset_id, 'started': timestamp}
+            tmp_path = checkpoint_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(checkpoint, f)
+            os.replace(tmp_path, checkpoint_path)
+            if os.path.exists(completed_path):
+                os.remove(completed_path)
         
         if not curves_to_process:
             print("✅ All curves processed!")
             return self._load_existing_summary(dataset_dir)
         
         if n_workers is None:
-            n_workers = max(1, mp.cpu_count() - 1)
+            n_workers = default_n_workers()
         
         print(f"Processing {len(curves_to_process)} curves with {n_workers} workers")
         
-        fit_func = partial(self._fit_single_curve, time_data=time_data, df=df)
+        # Ship each worker a single cleaned column, not the whole DataFrame, plus
+        # its valid length so all curves of that length share one time slice
+        od_matrix = np.ascontiguousarray(df[curves_to_process].to_numpy(dtype=np.float32).T)
+        valid = ~np.isnan(od_matrix)
+        valid_lens = valid.sum(axis=1)
+        # Curves padded only with trailing NaNs (the usual case) are plain slices
+        leading_lens = np.cumprod(valid, axis=1).sum(axis=1)
+        payloads = []
+        for row, c in enumerate(curves_to_process):
+            n_points = int(valid_lens[row])
+            if leading_lens[row] == n_points:
+                od_data = od_matrix[row, :n_points]
+            else:
+                od_data = od_matrix[row][valid[row]]
+            payloads.append((c, od_data, n_points))
+        time_slices = {n: time_data[:n] for n in {n for _, _, n in payloads}}
+        fit_func = self._fit_single_curve
         results = []
         batch_size = self.checkpoint_interval
         
-        for batch_start in range(0, len(curves_to_process), batch_size):
-            batch_end = min(batch_start + batch_size, len(curves_to_process))
-            batch_curves = curves_to_process[batch_start:batch_end]
-            
-            if n_workers > 1:
-                with mp.Pool(n_workers) as pool:
-                    batch_results = list(tqdm(pool.imap(fit_func, batch_curves), total=len(batch_curves)))
-            else:
-                batch_results = [fit_func(curve) for curve in tqdm(batch_curves)]
-            
-            results.extend(batch_results)
-            completed.update(batch_curves)
-            checkpoint['completed_curves'] = list(completed)
-            with open(checkpoint_path, 'w') as f:
-                json.dump(checkpoint, f)
-            
-            temp_df = pd.DataFrame(results)
-            temp_df.to_csv(os.path.join(dataset_dir, 'results_temp.csv'), index=False)
+        # Append each batch instead of rewriting every result so far;
+        # a fresh run starts a new file, a resumed run keeps earlier rows
+        temp_path = os.path.join(dataset_dir, 'results_temp.csv')
+        if not completed and os.path.exists(temp_path):
+            os.remove(temp_path)
+        
+        # One pool for the whole run; re-forking per checkpoint batch is wasted work.
+        # Time slices reach each worker once via the initializer, not once per task.
+        if n_workers > 1:
+            # One BLAS thread per worker; n_workers processes already fill the cores.
+            # The env vars are only set while the workers start, so the caller's
+            # environment (and its own BLAS threading) is left as it was
+            blas_vars = ('OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS', 'OMP_NUM_THREADS')
+            unset = [var for var in blas_vars if var not in os.environ]
+            for var in unset:
+                os.environ[var] = '1'
+            try:
+                # forkserver avoids forking a parent with live BLAS threads (not on Windows)
+                methods = mp.get_all_start_methods()
+                ctx = mp.get_context('forkserver' if 'forkserver' in methods else None)
+                pool = ctx.Pool(
+                    n_workers,
+                    initializer=_init_pool_worker,
+                    initargs=(time_slices,),
+                    maxtasksperchild=MAX_TASKS_PER_CHILD
+                )
+            finally:
+                for var in unset:
+                    os.environ.pop(var, None)
+        else:
+            pool = None
+            _init_worker(time_slices)
+        try:
+            for batch_start in range(0, len(payloads), batch_size):
+                batch_end = min(batch_start + batch_size, len(payloads))
+                batch_payloads = payloads[batch_start:batch_end]
+                
+                if pool is not None:
+                    # Cap at one chunk per worker so small checkpoint batches stay spread out
+                    chunksize = max(1, min(TASK_CHUNK_SIZE, len(batch_payloads) // n_workers))
+                    batch_iter = pool.imap_unordered(fit_func, batch_payloads, chunksize=chunksize)
+                    batch_results = list(tqdm(batch_iter, total=len(batch_payloads)))
+                else:
+                    batch_results = [fit_func(payload) for payload in tqdm(batch_payloads)]
+                
+                results.extend(batch_results)
+                batch_curves = [curve_name for curve_name, _, _ in batch_payloads]
+                completed.update(batch_curves)
+                with open(completed_path, 'a') as f:
+                    f.write(''.join(json.dumps(c) + '\n' for c in batch_curves))
+                
+                batch_df = pd.DataFrame(batch_results).reindex(columns=RESULT_COLUMNS)
+                batch_df.to_csv(temp_path, mode='a', header=not os.path.exists(temp_path), index=False)
+        finally:
+            if pool is not None:
+                pool.terminate()
         
         results_df = pd.DataFrame(results)
         results_path = os.path.join(dataset_dir, f'results_{timestamp}.csv')
         results_df.to_csv(results_path, index=False)
         
-        if os.path.exists(checkpoint_path):
-            os.remove(checkpoint_path)
+        for path in (checkpoint_path, completed_path):
+            if os.path.exists(path):
+                os.remove(path)
         
         return self._generate_summary(results_df, metadata, dataset_dir, timestamp)
     
-    def _fit_single_curve(self, curve_name, time_data, df):
+    def _fit_single_curve(self, payload):
+        curve_name, od_data, n_points = payload
         try:
-            od_data = df[curve_name].dropna().values
-            aligned_time = time_data[:len(od_data)]
-            return fit_rap_curve(aligned_time, od_data, curve_name=curve_name, verbose=False)
+            aligned_time = _TIME_SLICES[n_points]
+            return fit_rap_curve(aligned_time, od_data, curve_name=curve_name,
+                                 verbose=False, return_extra=False)
         except Exception as e:
             return {'curve': curve_name, 'success': False, 'error': str(e)}
     
@@ -142,11 +274,11 @@ class AutomatedRAPProcessor:
         print(f"{'='*70}\n")
     
     def _load_existing_summary(self, dataset_dir):
-        json_files = glob.glob(os.path.join(dataset_dir, 'summary_*.json'))
-        if json_files:
-            with open(sorted(json_files)[-1], 'r') as f:
-                return json.load(f)
-        return {}
+        json_files = list(Path(dataset_dir).glob('summary_*.json'))
+        if not json_files:
+            return {}
+        latest = max(json_files, key=lambda p: p.stat().st_mtime)
+        return json.loads(latest.read_text())
 
 def process_dataset_auto(dataset_id, max_curves=None, n_workers=None):
     processor = AutomatedRAPProcessor()
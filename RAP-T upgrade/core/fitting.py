@@ -16,12 +16,15 @@ Date: November 2025
 
 import numpy as np
 import warnings
-from scipy.optimize import curve_fit
+from scipy.optimize import least_squares
 from core.rap_model import (
-    rap_model_smooth as rap_model,  # Use SMOOTH version for stability
+    rap_ode_smooth,
     logistic_model, 
+    smooth_sigmoid,
+    njit,
     BIFURCATION_THRESHOLD, 
     ATTRACTOR_LOCK,
+    SIGMA,
     check_attractor_convergence
 )
 
@@ -29,7 +32,153 @@ from core.rap_model import (
 warnings.filterwarnings("ignore", category=RuntimeWarning)
 
 
-def fit_rap_curve(time_data, od_data, curve_name='Curve', verbose=True):
+@njit(cache=True)
+def _rap_sensitivity_ode(state, time, r, d, K):
+    """
+    RAP ODE augmented with forward sensitivities dP/dr, dP/dd, dP/dK.
+    
+    Each sensitivity S obeys dS/dt = (df/dP) * S + df/dtheta with S(0) = 0,
+    since P0 is fixed by the data and not fitted.
+    """
+    P = state[0]
+    u = P / K
+    
+    # Phase weights and their derivatives w.r.t. utilization
+    s_b = smooth_sigmoid(u, BIFURCATION_THRESHOLD, SIGMA)
+    s_a = smooth_sigmoid(u, ATTRACTOR_LOCK, SIGMA)
+    ds_b = SIGMA * s_b * (1.0 - s_b)
+    ds_a = SIGMA * s_a * (1.0 - s_a)
+    
+    # g = effective_rate / r (see rap_rate_smooth)
+    pull = 1.0 + d * (ATTRACTOR_LOCK - u)
+    resist = 0.05 - d * 0.5 * (u - ATTRACTOR_LOCK)
+    g = (1.0 - s_b) + s_b * (1.0 - s_a) * pull + s_a * resist
+    dg_du = (
+        -ds_b
+        + (ds_b * (1.0 - s_a) - s_b * ds_a) * pull
+        - s_b * (1.0 - s_a) * d
+        + ds_a * resist
+        - s_a * d * 0.5
+    )
+    dg_dd = s_b * (1.0 - s_a) * (ATTRACTOR_LOCK - u) - s_a * 0.5 * (u - ATTRACTOR_LOCK)
+    
+    dP_dt = r * g * P * (1.0 - u)
+    df_dP = r * (dg_du * u * (1.0 - u) + g * (1.0 - 2.0 * u))
+    df_dr = g * P * (1.0 - u)
+    df_dd = r * dg_dd * P * (1.0 - u)
+    df_dK = r * P * u / K * (g - dg_du * (1.0 - u))
+    
+    derivs = np.empty(4)
+    derivs[0] = dP_dt
+    derivs[1] = df_dP * state[1] + df_dr
+    derivs[2] = df_dP * state[2] + df_dd
+    derivs[3] = df_dP * state[3] + df_dK
+    return derivs
+
+
+@njit(cache=True)
+def _rap_rhs(state, time, r, d, K, sens):
+    """RAP right-hand side: P only, or P plus its (r, d, K) sensitivities."""
+    if sens:
+        return _rap_sensitivity_ode(state, time, r, d, K)
+    derivs = np.empty(1)
+    derivs[0] = rap_ode_smooth(state[0], time, r, d, K)
+    return derivs
+
+
+@njit(cache=True)
+def _integrate_rap(t, r, d, K, P0, sens, rtol, atol):
+    """
+    Integrate the smooth RAP ODE with an adaptive Dormand-Prince 5(4) stepper.
+    
+    Compiled end to end, so least_squares' thousands of model evaluations
+    per fit don't pay a Python callback per ODE step as with odeint. Steps
+    are clipped to land on each requested time point.
+    
+    Returns:
+    --------
+    array
+        (N, 1) trajectory, or (N, 4) trajectory plus sensitivities if sens
+    """
+    n_state = 4 if sens else 1
+    out = np.empty((len(t), n_state))
+    y = np.zeros(n_state)
+    y[0] = P0
+    out[0] = y
+    h = (t[-1] - t[0]) * 1e-3 if len(t) > 1 else 0.0
+    
+    for i in range(1, len(t)):
+        tc = t[i - 1]
+        t_end = t[i]
+        while tc < t_end:
+            h = min(h, t_end - tc)
+            k1 = _rap_rhs(y, tc, r, d, K, sens)
+            k2 = _rap_rhs(y + h * (1/5 * k1), tc + h/5, r, d, K, sens)
+            k3 = _rap_rhs(y + h * (3/40 * k1 + 9/40 * k2), tc + 3*h/10, r, d, K, sens)
+            k4 = _rap_rhs(y + h * (44/45 * k1 - 56/15 * k2 + 32/9 * k3), tc + 4*h/5, r, d, K, sens)
+            k5 = _rap_rhs(y + h * (19372/6561 * k1 - 25360/2187 * k2 + 64448/6561 * k3 - 212/729 * k4), tc + 8*h/9, r, d, K, sens)
+            k6 = _rap_rhs(y + h * (9017/3168 * k1 - 355/33 * k2 + 46732/5247 * k3 + 49/176 * k4 - 5103/18656 * k5), tc + h, r, d, K, sens)
+            y_new = y + h * (35/384 * k1 + 500/1113 * k3 + 125/192 * k4 - 2187/6784 * k5 + 11/84 * k6)
+            k7 = _rap_rhs(y_new, tc + h, r, d, K, sens)
+            
+            # Embedded 4th-order error estimate, worst component
+            err = h * (71/57600 * k1 - 71/16695 * k3 + 71/1920 * k4 - 17253/339200 * k5 + 22/525 * k6 - 1/40 * k7)
+            ratio = np.max(np.abs(err) / (atol + rtol * np.maximum(np.abs(y), np.abs(y_new))))
+            if not np.isfinite(ratio):
+                ratio = 1e6  # blown-up trial step: shrink hard
+            if ratio <= 1.0:
+                tc += h
+                y = y_new
+            h *= min(5.0, max(0.2, 0.9 * ratio ** -0.2)) if ratio > 0 else 5.0
+            
+            # Step size collapsed (non-finite state) - give up like odeint would
+            if h < 1e-12 * (abs(t_end) + 1.0):
+                out[i:] = np.nan
+                return out
+        
+        out[i] = y
+    
+    return out
+
+
+@njit(cache=True)
+def _rap_residuals(p, t, od, P0):
+    """RAP trajectory minus data at parameters p = (r, d, K)."""
+    return _integrate_rap(t, p[0], p[1], p[2], P0, False, 1e-8, 1e-10)[:, 0] - od
+
+
+@njit(cache=True)
+def _rap_jac(p, t, P0):
+    """
+    Analytic Jacobian of the RAP trajectory w.r.t. p = (r, d, K).
+    
+    Returns an (N, 3) array obtained by integrating the sensitivity
+    equations alongside the state, replacing finite-difference estimates.
+    """
+    return _integrate_rap(t, p[0], p[1], p[2], P0, True, 1e-6, 1e-8)[:, 1:]
+
+
+def _rap_simulate(t, r, d, K, P0):
+    """Fitted RAP trajectory on the data's time points (same integrator as the fit)."""
+    return _integrate_rap(t, r, d, K, P0, False, 1e-8, 1e-10)[:, 0]
+
+
+# Compile (or load from the on-disk cache) now, not inside the first fit
+_rap_residuals(np.array([1.0, 1.0, 1.0]), np.array([0.0, 1.0]), np.zeros(2), 0.1)
+_rap_jac(np.array([1.0, 1.0, 1.0]), np.array([0.0, 1.0]), 0.1)
+
+
+def _logistic_jac(t, r, K, P0):
+    """Closed-form Jacobian of logistic_model w.r.t. (r, K), shape (N, 2)."""
+    exponential = np.exp(-r * t)
+    denom = 1.0 + (K / P0 - 1.0) * exponential
+    dP_dr = K * (K / P0 - 1.0) * t * exponential / denom ** 2
+    dP_dK = 1.0 / denom - K * exponential / (P0 * denom ** 2)
+    return np.column_stack((dP_dr, dP_dK))
+
+
+def fit_rap_curve(time_data, od_data, curve_name='Curve', verbose=True, tol=1e-5,
+                  full_comparison=True, return_extra=True):
     """
     Fit RAP model to empirical growth curve data.
     
@@ -43,6 +192,18 @@ def fit_rap_curve(time_data, od_data, curve_name='Curve', verbose=True):
         Identifier for this curve
     verbose : bool
         Print detailed results (default: True)
+    tol : float
+        xtol/ftol/gtol passed to both least-squares fits (default: 1e-5).
+        OD noise is ~1e-2, so parameters shift by <0.5% of the noise
+        scale compared with scipy's 1e-8 defaults.
+    full_comparison : bool
+        Always run the logistic fit (default: True). If False, the logistic
+        fit is skipped when RAP already fits within 2% normalized RMSE;
+        such curves report sse_logistic=NaN and rap_better=True.
+    return_extra : bool
+        Include the 100%-capacity diagnostics (tight_stable_points_100,
+        converged_100, distance_100) (default: True). Batch pipelines that
+        don't report them can pass False.
     
     Returns:
     --------
@@ -82,6 +243,10 @@ def fit_rap_curve(time_data, od_data, curve_name='Curve', verbose=True):
     }
     
     try:
+        # Compiled residuals/Jacobians want plain contiguous float64 arrays
+        time_data = np.ascontiguousarray(time_data, dtype=np.float64)
+        od_data = np.ascontiguousarray(od_data, dtype=np.float64)
+        
         # Get initial population
         P0 = max(od_data[0], 1e-6)  # Avoid zero initialization
         result['P0'] = P0
@@ -92,13 +257,12 @@ def fit_rap_curve(time_data, od_data, curve_name='Curve', verbose=True):
         bounds_rap = ([0.1, 0.1, max_od], [3.0, 5.0, max_od * 1.5])
         p0_rap = [1.4, 2.0, max_od * 1.1]
         
-        popt_rap, _ = curve_fit(
-            lambda t, r, d, K: rap_model(t, r, d, K, P0),
-            time_data,
-            od_data,
-            p0=p0_rap,
-            bounds=bounds_rap,
-            maxfev=5000
+        popt_rap = _solve_least_squares(
+            lambda p: _rap_residuals(p, time_data, od_data, P0),
+            lambda p: _rap_jac(p, time_data, P0),
+            p0_rap,
+            bounds_rap,
+            tol
         )
         
         r_rap, d_rap, K_rap = popt_rap
@@ -107,7 +271,7 @@ def fit_rap_curve(time_data, od_data, curve_name='Curve', verbose=True):
         result['K'] = K_rap
         
         # Simulate RAP trajectory
-        sim_rap = rap_model(time_data, r_rap, d_rap, K_rap, P0)
+        sim_rap = _rap_simulate(time_data, r_rap, d_rap, K_rap, P0)
         result['sim_rap'] = sim_rap
         
         # Calculate RAP error
@@ -118,30 +282,38 @@ def fit_rap_curve(time_data, od_data, curve_name='Curve', verbose=True):
         bounds_log = ([0.1, max_od], [3.0, max_od * 1.5])
         p0_log = [1.4, max_od * 1.1]
         
-        try:
-            popt_log, _ = curve_fit(
-                lambda t, r, K: logistic_model(t, r, K, P0),
-                time_data,
-                od_data,
-                p0=p0_log,
-                bounds=bounds_log,
-                maxfev=5000
-            )
-            
-            r_log, K_log = popt_log
-            sim_log = logistic_model(time_data, r_log, K_log, P0)
-            sse_log = np.sum((sim_log - od_data) ** 2)
-            
-            result['sim_logistic'] = sim_log
-            result['sse_logistic'] = sse_log
-            result['rap_better'] = sse_rap < sse_log
-            
-        except RuntimeError:
-            # Logistic fit failed, but RAP succeeded
+        nrmse_rap = np.sqrt(sse_rap) / np.linalg.norm(od_data)
+        
+        if not full_comparison and nrmse_rap < 0.02:
+            # RAP already fits cleanly - skip the comparison fit
             result['sim_logistic'] = None
-            result['sse_logistic'] = np.inf
+            result['sse_logistic'] = np.nan
             result['rap_better'] = True
         
+        else:
+            try:
+                popt_log = _solve_least_squares(
+                    lambda p: logistic_model(time_data, *p, P0) - od_data,
+                    lambda p: _logistic_jac(time_data, *p, P0),
+                    p0_log,
+                    bounds_log,
+                    tol
+                )
+                
+                r_log, K_log = popt_log
+                sim_log = logistic_model(time_data, r_log, K_log, P0)
+                sse_log = np.sum((sim_log - od_data) ** 2)
+                
+                result['sim_logistic'] = sim_log
+                result['sse_logistic'] = sse_log
+                result['rap_better'] = sse_rap < sse_log
+            
+            except RuntimeError:
+                # Logistic fit failed, but RAP succeeded
+                result['sim_logistic'] = None
+                result['sse_logistic'] = np.inf
+                result['rap_better'] = True
+        
         # Analyze convergence (Gemini + Copilot suggestions)
         # Use 5% tolerance since 80-90% is within attractor zone
         convergence = check_attractor_convergence(sim_rap, K_rap, tolerance=0.05)
@@ -151,59 +323,24 @@ def fit_rap_curve(time_data, od_data, curve_name='Curve', verbose=True):
         result['stable_points'] = convergence['stable_points']
         
         # Additional stable points analysis (Gemini suggestion)
-        # Count points within 1% of attractor
-        rap_utilization = sim_rap / K_rap
-        tight_stable_85 = np.sum(
-            (rap_utilization > ATTRACTOR_LOCK - 0.01) & 
-            (rap_utilization < ATTRACTOR_LOCK + 0.01)
-        )
+        # Count points within 1% of attractor - and, GEMINI'S NEW INSIGHT,
+        # within 1% of 100% too - in a single pass over the trajectory
+        tight_stable_85, tight_stable_100 = _tight_stable_counts(sim_rap, K_rap)
         result['tight_stable_points_85'] = tight_stable_85
         
-        # GEMINI'S NEW INSIGHT: Track 100% convergence too!
-        tight_stable_100 = np.sum(
-            (rap_utilization > 0.99) & 
-            (rap_utilization < 1.01)
-        )
-        result['tight_stable_points_100'] = tight_stable_100
-        
-        # Check if converged to 100% instead of 85%
-        distance_100 = abs(result['final_util'] - 1.0)
-        result['converged_100'] = distance_100 < 0.02
-        result['distance_100'] = distance_100
+        if verbose or return_extra:
+            result['tight_stable_points_100'] = tight_stable_100
+            
+            # Check if converged to 100% instead of 85%
+            distance_100 = abs(result['final_util'] - 1.0)
+            result['converged_100'] = distance_100 < 0.02
+            result['distance_100'] = distance_100
         
         result['success'] = True
         
         # Print results if verbose
         if verbose:
-            print(f"\n{'='*60}")
-            print(f"RAP FIT RESULTS: {curve_name}")
-            print(f"{'='*60}")
-            print(f"Parameters:")
-            print(f"  Growth rate (r):     {r_rap:.3f}")
-            print(f"  Snap damping (d):    {d_rap:.3f}")
-            print(f"  Carrying capacity:   {K_rap:.3f}")
-            print(f"\nConvergence Analysis:")
-            print(f"  Final utilization:   {result['final_util']:.3f} ({result['final_util']*100:.1f}%)")
-            print(f"  Distance from 85%:   {result['distance']:.3f}")
-            print(f"  Stable at lock:      {result['stable_points']} points")
-            print(f"  Tight stable at 85%: {tight_stable_85} points")
-            print(f"  Tight stable at 100%:{tight_stable_100} points")
-            print(f"\nModel Comparison:")
-            print(f"  SSE (RAP):           {sse_rap:.3f}")
-            print(f"  SSE (Logistic):      {result['sse_logistic']:.3f}")
-            print(f"  RAP superior:        {'✅ YES' if result['rap_better'] else '❌ NO'}")
-            print(f"\nConvergence Status:")
-            if result['converged']:
-                print(f"  {'✅ RAP 85% CONVERGENCE DETECTED'}")
-                print(f"  System locked onto 85% attractor!")
-            elif result.get('converged_100', False):
-                print(f"  {'⚠️  100% CONVERGENCE DETECTED'}")
-                print(f"  System went to full capacity (not 85%)")
-                print(f"  This suggests weak RAP dynamics (low d)")
-            else:
-                print(f"  {'❓ NO CLEAR CONVERGENCE'}")
-                print(f"  System did not lock onto any attractor")
-            print(f"{'='*60}\n")
+            _print_fit_report(result)
         
     except RuntimeError as e:
         result['error'] = f"Fitting failed: {str(e)}"
@@ -218,7 +355,93 @@ def fit_rap_curve(time_data, od_data, curve_name='Curve', verbose=True):
     return result
 
 
-def batch_fit_curves(time_data, od_dataframe, od_columns=None, verbose=False):
+def _print_fit_report(result):
+    """Print the human-readable report for a successful fit_rap_curve result."""
+    print(f"\n{'='*60}")
+    print(f"RAP FIT RESULTS: {result['curve']}")
+    print(f"{'='*60}")
+    print(f"Parameters:")
+    print(f"  Growth rate (r):     {result['r']:.3f}")
+    print(f"  Snap damping (d):    {result['d']:.3f}")
+    print(f"  Carrying capacity:   {result['K']:.3f}")
+    print(f"\nConvergence Analysis:")
+    print(f"  Final utilization:   {result['final_util']:.3f} ({result['final_util']*100:.1f}%)")
+    print(f"  Distance from 85%:   {result['distance']:.3f}")
+    print(f"  Stable at lock:      {result['stable_points']} points")
+    print(f"  Tight stable at 85%: {result['tight_stable_points_85']} points")
+    print(f"  Tight stable at 100%:{result['tight_stable_points_100']} points")
+    print(f"\nModel Comparison:")
+    print(f"  SSE (RAP):           {result['sse_rap']:.3f}")
+    print(f"  SSE (Logistic):      {result['sse_logistic']:.3f}")
+    print(f"  RAP superior:        {'✅ YES' if result['rap_better'] else '❌ NO'}")
+    print(f"\nConvergence Status:")
+    if result['converged']:
+        print(f"  {'✅ RAP 85% CONVERGENCE DETECTED'}")
+        print(f"  System locked onto 85% attractor!")
+    elif result.get('converged_100', False):
+        print(f"  {'⚠️  100% CONVERGENCE DETECTED'}")
+        print(f"  System went to full capacity (not 85%)")
+        print(f"  This suggests weak RAP dynamics (low d)")
+    else:
+        print(f"  {'❓ NO CLEAR CONVERGENCE'}")
+        print(f"  System did not lock onto any attractor")
+    print(f"{'='*60}\n")
+
+
+def _solve_least_squares(residuals, jac, x0, bounds, tol):
+    """
+    Bounded 'trf' least squares with the same failure contract as curve_fit.
+    
+    Raises RuntimeError when no optimum is found within 5000 evaluations.
+    """
+    fit = least_squares(
+        residuals,
+        x0,
+        jac=jac,
+        bounds=bounds,
+        method='trf',
+        x_scale='jac',
+        tr_solver='exact',
+        xtol=tol,
+        ftol=tol,
+        gtol=tol,
+        max_nfev=5000
+    )
+    if not fit.success:
+        raise RuntimeError(f"Optimal parameters not found: {fit.message}")
+    return fit.x
+
+
+@njit(cache=True)
+def _tight_stable_counts(sim, K):
+    """Count points within 1% of the 85% attractor and of full capacity in one pass."""
+    count_85 = 0
+    count_100 = 0
+    for i in range(sim.shape[0]):
+        u = sim[i] / K
+        if ATTRACTOR_LOCK - 0.01 < u < ATTRACTOR_LOCK + 0.01:
+            count_85 += 1
+        if 0.99 < u < 1.01:
+            count_100 += 1
+    return count_85, count_100
+
+
+def _fit_batch_row(payload):
+    """Pool worker for batch_fit_curves: fit one (name, time, od, verbose) row."""
+    col, aligned_time, od_data, verbose = payload
+    return fit_rap_curve(aligned_time, od_data, curve_name=col, verbose=verbose)
+
+
+def warm_up_worker():
+    """
+    Pool initializer: run one throwaway fit so each worker loads every
+    Numba kernel and scipy's solver before it receives real curves.
+    """
+    t = np.linspace(0.0, 10.0, 20)
+    fit_rap_curve(t, 1.0 / (1.0 + np.exp(-t)), curve_name='_warm', verbose=False)
+
+
+def batch_fit_curves(time_data, od_dataframe, od_columns=None, verbose=False, n_workers=1):
     """
     Fit RAP model to multiple curves in batch.
     
@@ -232,6 +455,8 @@ def batch_fit_curves(time_data, od_dataframe, od_columns=None, verbose=False):
         Specific columns to fit. If None, auto-detects OD columns
     verbose : bool
         Print results for each curve (default: False for batch)
+    n_workers : int
+        Worker processes to fit curves in parallel (default: 1, in-process)
     
     Returns:
     --------
@@ -240,7 +465,13 @@ def batch_fit_curves(time_data, od_dataframe, od_columns=None, verbose=False):
     
     Notes:
     ------
-    Implements GPT + Copilot batch processing suggestions
+    Implements GPT + Copilot batch processing suggestions.
+    Curves are stacked into one (n_curves, n_time) array so NaN cleaning
+    and length checks happen in a single vectorized pass.
+    Each curve is still fitted with its own least_squares call: one joint
+    block-diagonal problem over all curves ran no faster with the compiled
+    residuals, and its shared xtol/ftol stop rule let poorly constrained
+    curves (mostly d) stop early. Use n_workers for throughput instead.
     """
     import pandas as pd
     
@@ -263,26 +494,44 @@ def batch_fit_curves(time_data, od_dataframe, od_columns=None, verbose=False):
     
     print(f"\n🔬 Starting batch fitting for {total} curves...")
     
-    for idx, col in enumerate(od_columns, 1):
-        od_data = od_dataframe[col].dropna().values
-        
-        if len(od_data) < 6:
-            print(f"⚠️  Skipping {col}: insufficient data ({len(od_data)} points)")
+    # Structure-of-arrays: one row per curve, validity resolved up front
+    od_matrix = od_dataframe[od_columns].to_numpy(dtype=np.float64).T
+    valid = ~np.isnan(od_matrix)
+    n_valid = valid.sum(axis=1)
+    
+    payloads = []
+    for idx, col in enumerate(od_columns):
+        if n_valid[idx] < 6:
+            print(f"⚠️  Skipping {col}: insufficient data ({n_valid[idx]} points)")
             continue
         
+        od_data = od_matrix[idx][valid[idx]]
+        
         # Align time data to match OD data length
         aligned_time = time_data[:len(od_data)]
-        
-        print(f"  [{idx}/{total}] Fitting {col}...", end='')
-        
-        result = fit_rap_curve(aligned_time, od_data, curve_name=col, verbose=verbose)
-        
-        if result['success']:
-            print(f" ✅")
-        else:
-            print(f" ❌ {result['error']}")
-        
-        results.append(result)
+        payloads.append((idx + 1, (col, aligned_time, od_data, verbose)))
+    
+    if n_workers > 1 and len(payloads) > 1:
+        import multiprocessing as mp
+        pool = mp.Pool(min(n_workers, len(payloads)), initializer=warm_up_worker)
+        fitted = pool.imap(_fit_batch_row, [p for _, p in payloads])
+    else:
+        pool = None
+        fitted = map(_fit_batch_row, [p for _, p in payloads])
+    
+    try:
+        for (idx, (col, _, _, _)), result in zip(payloads, fitted):
+            print(f"  [{idx}/{total}] Fitting {col}...", end='')
+            
+            if result['success']:
+                print(f" ✅")
+            else:
+                print(f" ❌ {result['error']}")
+            
+            results.append(result)
+    finally:
+        if pool is not None:
+            pool.terminate()
     
     # Convert to DataFrame (Copilot suggestion)
     results_df = pd.DataFrame(results)
@@ -15,6 +15,16 @@ Version: 2.0 (Smoothed)
 import numpy as np
 from scipy.integrate import odeint
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional - fall back to plain Python
+    prange = range
+    
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 # RAP Constants
 BIFURCATION_THRESHOLD = 0.50  # 50% - Edge of chaos
 ATTRACTOR_LOCK = 0.85          # 85% - Optimal stable state
@@ -25,6 +35,7 @@ GSI = 1 / (PHI ** 2)           # Golden ratio damping ≈ 0.382
 SIGMA = 500.0  # High value keeps transitions sharp while maintaining differentiability
 
 
+@njit(cache=True)
 def smooth_sigmoid(x, center, sigma=SIGMA):
     """
     Smooth sigmoid transition function.
@@ -51,6 +62,7 @@ def smooth_sigmoid(x, center, sigma=SIGMA):
     return 1.0 / (1.0 + np.exp(-sigma * (x - center)))
 
 
+@njit(cache=True)
 def smooth_step(x, low, high, sigma=SIGMA):
     """
     Smooth step function between two values.
@@ -74,6 +86,7 @@ def smooth_step(x, low, high, sigma=SIGMA):
     return smooth_sigmoid(x, low, sigma) * (1.0 - smooth_sigmoid(x, high, sigma))
 
 
+@njit(cache=True)
 def rap_rate_smooth(utilization, growth_rate, snap_damping):
     """
     Calculate effective recursion rate with SMOOTH transitions.
@@ -136,6 +149,7 @@ def rap_rate_smooth(utilization, growth_rate, snap_damping):
     return effective_rate
 
 
+@njit(cache=True)
 def rap_ode_smooth(population, time, growth_rate, snap_damping, carrying_capacity):
     """
     Ordinary Differential Equation for RAP with SMOOTH dynamics.
@@ -160,7 +174,8 @@ def rap_ode_smooth(population, time, growth_rate, snap_damping, carrying_capacit
     
     Notes:
     ------
-    Uses smooth rap_rate_smooth() for numerical stability
+    Uses smooth rap_rate_smooth() for numerical stability.
+    JIT-compiled with numba when available, since odeint calls it once per step.
     """
     utilization = population / carrying_capacity
     effective_rate = rap_rate_smooth(utilization, growth_rate, snap_damping)
@@ -225,6 +240,7 @@ def rap_model(time_array, growth_rate, snap_damping, carrying_capacity, initial_
     return rap_model_smooth(time_array, growth_rate, snap_damping, carrying_capacity, initial_population)
 
 
+@njit(cache=True)
 def logistic_model(time_array, growth_rate, carrying_capacity, initial_population):
     """
     Standard logistic model for comparison.
@@ -268,6 +284,12 @@ def check_attractor_convergence(population_array, carrying_capacity, tolerance=0
 
 
 if __name__ == "__main__":
+    # Numba's on-disk cache refers to this module as core.rap_model,
+    # so keep the project root importable when run as a script
+    import os
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    
     # Test the smoothed model
     print("RAP Core Model v2.0 - SMOOTHED")
     print("=" * 60)
@@ -2,12 +2,30 @@
 import os
 import json
 import glob
+import hashlib
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
+try:
+    import pyarrow  # noqa: F401 - only needed as a read_csv engine
+    _CSV_ENGINE = 'pyarrow'
+except ImportError:
+    _CSV_ENGINE = 'c'
+
+try:
+    import python_calamine  # noqa: F401 - only needed as a read_excel engine
+    # pandas only accepts engine='calamine' from 2.2 on
+    _pandas_version = tuple(int(part) for part in pd.__version__.split('.')[:2])
+    _XLSX_ENGINE = 'calamine' if _pandas_version >= (2, 2) else None
+except ImportError:
+    _XLSX_ENGINE = None  # pandas default (openpyxl)
+
+# Parsed datasets are cached here so reruns skip Excel/CSV parsing
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'rap'
+
 class UniversalDataLoader:
-    def __init__(self, config_path='config/datasets.json'):
+    def __init__(self, config_path='config/datasets.json', cache_dir=DEFAULT_CACHE_DIR):
         # Get the directory where this script is located
         self.base_dir = Path(__file__).parent.parent.resolve()
         
@@ -17,6 +35,7 @@ class UniversalDataLoader:
         
         self.config_path = config_path
         self.configs = self._load_configs()
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
     
     def _load_configs(self):
         with open(self.config_path, 'r') as f:
@@ -35,7 +54,7 @@ class UniversalDataLoader:
             print(f"  Location: {config['data_directory']}")
         print("="*70 + "\n")
     
-    def load_dataset(self, dataset_id, max_files=None):
+    def load_dataset(self, dataset_id, max_files=None, use_cache=True):
         if dataset_id not in self.configs:
             raise ValueError(f"Dataset '{dataset_id}' not found")
         
@@ -62,11 +81,21 @@ class UniversalDataLoader:
         
         print(f"Found {len(files)} file(s)")
         
+        cache_path = self._cache_path(dataset_id, config, files) if use_cache else None
+        if cache_path is not None and cache_path.exists():
+            try:
+                cached = self._read_cache(cache_path, config)
+                print(f"♻️  Using cached copy: {cache_path}")
+                print(f"\n✅ Loaded {len(cached['curves'])} curves")
+                return cached
+            except Exception as e:
+                print(f"⚠️ Ignoring unreadable cache ({str(e)})")
+        
         all_data = []
         for idx, filepath in enumerate(files, 1):
             print(f"  [{idx}/{len(files)}] {os.path.basename(filepath)}...", end='')
             try:
-                df = pd.read_excel(filepath) if filepath.endswith('.xlsx') else pd.read_csv(filepath)
+                df = self._read_table(filepath, config)
                 time_col = self._find_column(df, config['time_column_patterns'])
                 if not time_col:
                     print(" ⚠️ No time column")
@@ -78,9 +107,14 @@ class UniversalDataLoader:
                     print(" ⚠️ No OD columns")
                     continue
                 
-                file_id = os.path.basename(filepath).replace('.xlsx', '').replace('.csv', '')
+                file_id = os.path.basename(filepath).replace('.xlsx', '').replace('.csv', '').replace('.parquet', '')
                 renamed_cols = {col: f"{file_id}_{col}" for col in od_cols}
-                df_subset = df[od_cols].rename(columns=renamed_cols)
+                # OD readings carry <=4 significant digits; float32 halves memory and IPC.
+                # Plate-reader text ("OVRFLW", stray strings) becomes NaN so only that
+                # curve fails later instead of the whole load
+                df_subset = (df[od_cols].rename(columns=renamed_cols)
+                             .apply(pd.to_numeric, errors='coerce')
+                             .astype(np.float32))
                 all_data.append({'time': time_data, 'data': df_subset, 'file': filepath})
                 print(f" ✅ {len(od_cols)} curves")
             except Exception as e:
@@ -91,9 +125,11 @@ class UniversalDataLoader:
         
         min_length = min(len(d['time']) for d in all_data)
         reference_time = all_data[0]['time'][:min_length]
-        combined_df = pd.DataFrame()
-        for d in all_data:
-            combined_df = pd.concat([combined_df, d['data'].iloc[:min_length]], axis=1)
+        frames = [d['data'].iloc[:min_length] for d in all_data]
+        combined_df = pd.concat(frames, axis=1, sort=False)
+        
+        if cache_path is not None:
+            self._write_cache(cache_path, reference_time, combined_df)
         
         print(f"\n✅ Loaded {len(combined_df.columns)} curves")
         return {
@@ -103,6 +139,61 @@ class UniversalDataLoader:
             'curves': list(combined_df.columns)
         }
     
+    def _cache_path(self, dataset_id, config, files):
+        """Cache file keyed by config and each source file's path, mtime and size."""
+        if self.cache_dir is None:
+            return None
+        stamps = [(str(f), os.path.getmtime(f), os.path.getsize(f)) for f in files]
+        key_source = json.dumps([config, stamps], sort_keys=True, default=str)
+        key = hashlib.md5(key_source.encode()).hexdigest()
+        return self.cache_dir / f"{dataset_id}_{key}.npz"
+    
+    def _read_cache(self, cache_path, config):
+        with np.load(cache_path) as cached:
+            time_data = cached['time']
+            columns = [str(c) for c in cached['columns']]
+            combined_df = pd.DataFrame(cached['data'], columns=columns)
+        return {
+            'time': time_data,
+            'data': combined_df,
+            'metadata': config,
+            'curves': columns
+        }
+    
+    def _write_cache(self, cache_path, time_data, combined_df):
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                np.savez(
+                    f,
+                    time=np.asarray(time_data),
+                    data=combined_df.to_numpy(),
+                    columns=np.array([str(c) for c in combined_df.columns])
+                )
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            print(f"⚠️ Could not write dataset cache ({str(e)})")
+    
+    def _read_table(self, filepath, config):
+        """Read only the columns matching the time/OD patterns."""
+        patterns = [p.lower() for p in config['time_column_patterns'] + config['od_column_patterns']]
+        wanted = lambda col: any(p in str(col).lower() for p in patterns)
+        
+        if filepath.endswith('.xlsx'):
+            return pd.read_excel(filepath, usecols=wanted, engine=_XLSX_ENGINE)
+        
+        if filepath.endswith('.parquet'):
+            import pyarrow.parquet as pq
+            header = pq.read_schema(filepath).names
+            return pd.read_parquet(filepath, columns=[col for col in header if wanted(col)])
+        
+        header = pd.read_csv(filepath, nrows=0).columns
+        usecols = [col for col in header if wanted(col)]
+        if not usecols:
+            return pd.DataFrame(columns=header)
+        return pd.read_csv(filepath, usecols=usecols, engine=_CSV_ENGINE)
+    
     def _find_column(self, df, patterns):
         for col in df.columns:
             for pattern in patterns:
@@ -122,8 +213,8 @@ class UniversalDataLoader:
                     break
         return matching
 
-def load_dataset(dataset_id, max_files=None):
-    return UniversalDataLoader().load_dataset(dataset_id, max_files)
+def load_dataset(dataset_id, max_files=None, use_cache=True):
+    return UniversalDataLoader().load_dataset(dataset_id, max_files, use_cache=use_cache)
 
 def list_datasets():
     UniversalDataLoader().list_available_datasets()
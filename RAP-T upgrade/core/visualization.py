@@ -13,7 +13,14 @@ Author: The Potato Researcher 🥔
 Date: November 2025
 """
 
+import os
 import numpy as np
+import matplotlib
+
+# Headless batch runs (RAP_HEADLESS=1) skip GUI backend initialization
+if os.environ.get('RAP_HEADLESS') == '1':
+    matplotlib.use('Agg')
+
 import matplotlib.pyplot as plt
 from core.rap_model import BIFURCATION_THRESHOLD, ATTRACTOR_LOCK
 
@@ -206,7 +213,7 @@ def plot_utilization_trajectory(time_data, result, show_plot=True, save_path=Non
         plt.close()
 
 
-def plot_batch_summary(results_df, show_plot=True, save_path=None):
+def plot_batch_summary(results_df, show_plot=True, save_path=None, fig=None):
     """
     Create summary visualization for batch results.
     
@@ -218,6 +225,11 @@ def plot_batch_summary(results_df, show_plot=True, save_path=None):
         Display plot interactively
     save_path : str, optional
         Path to save figure
+    fig : Figure, optional
+        Figure to draw into, for reuse across many summaries. Its axes are
+        cleared (not re-created) and it is left open for the caller.
+        If None, a new constrained-layout figure is created and closed
+        after saving when show_plot is False.
     """
     
     successful = results_df[results_df['success'] == True]
@@ -226,11 +238,20 @@ def plot_batch_summary(results_df, show_plot=True, save_path=None):
         print("⚠️  No successful fits to visualize")
         return
     
-    fig, axes = plt.subplots(2, 2, figsize=(12, 10))
+    owns_fig = fig is None
+    if owns_fig:
+        fig, axes = plt.subplots(2, 2, figsize=(12, 10), constrained_layout=True)
+    elif len(fig.axes) == 4:
+        axes = np.array(fig.axes).reshape(2, 2)
+        for ax in axes.flat:
+            ax.clear()
+    else:
+        fig.clear()
+        axes = fig.subplots(2, 2)
     
     # 1. Final Utilization Distribution
     ax1 = axes[0, 0]
-    ax1.hist(successful['final_util'], bins=30, color='#1f77b4', alpha=0.7, edgecolor='black')
+    ax1.hist(successful['final_util'], bins=30, histtype='stepfilled', color='#1f77b4', alpha=0.7, edgecolor='black')
     ax1.axvline(x=ATTRACTOR_LOCK, color='red', linestyle='--', linewidth=2, label='85% Attractor')
     ax1.axvline(x=successful['final_util'].mean(), color='green', linestyle=':', linewidth=2, label='Mean')
     ax1.set_xlabel('Final Utilization')
@@ -241,7 +262,7 @@ def plot_batch_summary(results_df, show_plot=True, save_path=None):
     
     # 2. Distance from Attractor
     ax2 = axes[0, 1]
-    ax2.hist(successful['distance'], bins=30, color='#ff7f0e', alpha=0.7, edgecolor='black')
+    ax2.hist(successful['distance'], bins=30, histtype='stepfilled', color='#ff7f0e', alpha=0.7, edgecolor='black')
     ax2.axvline(x=0.02, color='red', linestyle='--', linewidth=2, label='2% Threshold')
     ax2.set_xlabel('Distance from 85%')
     ax2.set_ylabel('Frequency')
@@ -256,10 +277,10 @@ def plot_batch_summary(results_df, show_plot=True, save_path=None):
     
     if len(converged) > 0:
         ax3.scatter(converged['sse_rap'], converged['sse_logistic'], 
-                   alpha=0.6, s=50, color='green', label='Converged')
+                   alpha=0.6, s=50, color='green', label='Converged', rasterized=True)
     if len(not_converged) > 0:
         ax3.scatter(not_converged['sse_rap'], not_converged['sse_logistic'], 
-                   alpha=0.6, s=50, color='red', label='Not Converged')
+                   alpha=0.6, s=50, color='red', label='Not Converged', rasterized=True)
     
     # Diagonal line (equal SSE)
     max_sse = max(successful['sse_rap'].max(), successful['sse_logistic'].max())
@@ -282,16 +303,14 @@ def plot_batch_summary(results_df, show_plot=True, save_path=None):
             autopct='%1.1f%%', colors=colors, startangle=90)
     ax4.set_title(f'Convergence Rate\n(n={len(successful)})')
     
-    plt.tight_layout()
-    
     if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
+        fig.savefig(save_path, dpi=150, bbox_inches='tight')
         print(f"  📊 Batch summary saved: {save_path}")
     
     if show_plot:
         plt.show()
-    else:
-        plt.close()
+    elif owns_fig:
+        plt.close(fig)
 
 
 if __name__ == "__main__":
@@ -11,6 +11,7 @@ Author: The Potato Researcher 🥔
 Date: November 2025
 """
 
+import math
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -22,9 +23,196 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from core.universal_loader import UniversalDataLoader, load_dataset
+from core.universal_loader import UniversalDataLoader
 from core.fitting import fit_rap_curve
 
+
+@st.cache_resource
+def _get_loader():
+    """Parse config/datasets.json once per server process."""
+    return UniversalDataLoader()
+
+
+@st.cache_data(show_spinner=False)
+def _cached_load(dataset_id: str, max_files: int):
+    """Load a dataset once per (dataset_id, max_files); reruns hit the cache.
+    
+    Adds ``matrix`` (time x curve, column-major float32) and ``col_idx``
+    (curve -> column index) so reruns index arrays instead of DataFrame
+    columns. Per-curve views are not stored: cache_data pickles the return
+    value, and each view would be unpickled as its own copy.
+    """
+    data = _get_loader().load_dataset(dataset_id, max_files=max_files)
+    matrix = np.asfortranarray(data['data'].to_numpy(dtype=np.float32))
+    data['matrix'] = matrix
+    data['col_idx'] = {c: i for i, c in enumerate(data['curves'])}
+    return data
+
+
+@st.cache_data(show_spinner=False)
+def _cached_fit(dataset_id: str, curve_name: str, t_bytes: bytes, od_bytes: bytes):
+    """Fit one curve once per (dataset, curve, data); raw bytes keep hashing cheap.
+    
+    Simulated trajectories are only plotted here, so they are kept as float32
+    to halve the cached size and the Plotly payload.
+    """
+    result = fit_rap_curve(np.frombuffer(t_bytes), np.frombuffer(od_bytes),
+                           curve_name=curve_name, verbose=False)
+    for key in ('sim_rap', 'sim_logistic'):
+        if result.get(key) is not None:
+            result[key] = np.asarray(result[key], dtype=np.float32)
+    return result
+
+
+@st.cache_data(show_spinner=False)
+def _curve_arrays(dataset_id: str, curve_name: str, _data):
+    """Materialize one curve as contiguous float32 plus its non-NaN mask, once per curve.
+    
+    ``_data`` is excluded from hashing; the dataset is identified by ``dataset_id``.
+    """
+    od = np.ascontiguousarray(_data['matrix'][:, _data['col_idx'][curve_name]], dtype=np.float32)
+    return od, ~np.isnan(od)
+
+
+@st.cache_data(show_spinner=False)
+def _summary_metrics(dataset_id: str, curve_name: str, _data):
+    """Formatted (label, value) pairs for the Data Summary panel of one curve."""
+    od, mask = _curve_arrays(dataset_id, curve_name, _data)
+    initial_val = float(od[0])
+    final_val = float(od[-1])
+    max_val = float(od[mask].max()) if mask.any() else math.nan
+    growth_ratio = final_val / initial_val if initial_val > 0 else math.nan  # False for NaN
+    
+    fmt = lambda value, spec: "N/A" if math.isnan(value) else format(value, spec)
+    return [
+        ("Initial OD", fmt(initial_val, '.3f')),
+        ("Max OD", fmt(max_val, '.3f')),
+        ("Final OD", fmt(final_val, '.3f')),
+        ("Growth Ratio", fmt(growth_ratio, '.1f') + ("x" if not math.isnan(growth_ratio) else "")),
+    ]
+
+
+def _fit_curve(dataset_id, data, curve_name):
+    """Align a curve with its time points and fit it through the cache."""
+    od, mask = _curve_arrays(dataset_id, curve_name, data)
+    od_data = od[mask].astype(np.float64)  # solver works in float64
+    aligned_time = np.asarray(data['time'][:len(od_data)], dtype=np.float64)
+    return _cached_fit(dataset_id, curve_name, aligned_time.tobytes(), od_data.tobytes())
+
+
+# Longer traces are downsampled for display only; fits always use every point
+MAX_DISPLAY_POINTS = 2000
+DISPLAY_POINTS = 1000
+
+
+def _lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets downsampling of a finite (x, y) series.
+    
+    Keeps the first and last points and, from each of ``n_out - 2`` buckets,
+    the point forming the largest triangle with the previously kept point
+    and the mean of the next bucket - preserving the visual shape.
+    """
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return x, y
+    
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_hi = edges[i + 2] if i + 2 < len(edges) else n
+        ax, ay = x[prev], y[prev]
+        cx, cy = x[hi:nxt_hi].mean(), y[hi:nxt_hi].mean()
+        area = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+        prev = lo + int(np.argmax(area))
+        keep[i + 1] = prev
+    return x[keep], y[keep]
+
+
+def _display_xy(x, y):
+    """Drop NaNs and LTTB-downsample traces longer than MAX_DISPLAY_POINTS."""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(y) <= MAX_DISPLAY_POINTS:
+        return x, y
+    finite = ~np.isnan(y)
+    return _lttb(x[finite], y[finite], DISPLAY_POINTS)
+
+
+@st.cache_resource(max_entries=64)
+def _build_figure(dataset_id: str, curve_name: str, has_fit: bool, _data):
+    """Growth-curve figure for one curve, built once per (dataset, curve, fit state).
+    
+    Reruns reuse the cached Figure instead of rebuilding traces and layout;
+    callers must not mutate it.
+    """
+    time_data = _data['time']
+    od_data, _ = _curve_arrays(dataset_id, curve_name, _data)
+    result = _fit_curve(dataset_id, _data, curve_name) if has_fit else None
+    
+    fig = go.Figure()
+    
+    # WebGL for long curves; SVG is just as fast (and richer) for short ones
+    Trace = go.Scattergl if len(od_data) > 200 else go.Scatter
+    
+    # Raw data points
+    x_disp, y_disp = _display_xy(time_data, od_data)
+    fig.add_trace(Trace(
+        x=x_disp,
+        y=y_disp,
+        mode='markers',
+        name='Data',
+        marker=dict(size=6, color='#3498db', opacity=0.6)
+    ))
+    
+    # Add fitted curves if available
+    if result is not None and result['success']:
+        # RAP fit
+        x_disp, y_disp = _display_xy(time_data[:len(result['sim_rap'])], result['sim_rap'])
+        fig.add_trace(Trace(
+            x=x_disp,
+            y=y_disp,
+            mode='lines',
+            name='RAP Fit',
+            line=dict(color='#e74c3c', width=3)
+        ))
+        
+        # Logistic fit (if available)
+        if result['sim_logistic'] is not None:
+            x_disp, y_disp = _display_xy(time_data[:len(result['sim_logistic'])], result['sim_logistic'])
+            fig.add_trace(Trace(
+                x=x_disp,
+                y=y_disp,
+                mode='lines',
+                name='Logistic Fit',
+                line=dict(color='#f39c12', width=2, dash='dash')
+            ))
+        
+        # Add 85% line
+        K = result['K']
+        fig.add_hline(
+            y=K * 0.85,
+            line_dash="dot",
+            line_color="green",
+            annotation_text="85% Attractor",
+            annotation_position="right"
+        )
+    
+    fig.update_layout(
+        xaxis_title="Time (hours)",
+        yaxis_title="OD600 / Population",
+        height=500,
+        # A per-point hover index is costly on long traces
+        hovermode='closest' if len(od_data) <= MAX_DISPLAY_POINTS else False,
+        template='plotly_white',
+        showlegend=True
+    )
+    
+    return fig
+
+
 # Page config
 st.set_page_config(
     page_title="RAP Explorer",
@@ -41,36 +229,45 @@ st.sidebar.header("📂 Data Selection")
 
 # Load available datasets
 try:
-    loader = UniversalDataLoader()
+    loader = _get_loader()
     available_datasets = list(loader.configs.keys())
     
     if not available_datasets:
         st.error("No datasets configured in config/datasets.json")
         st.stop()
     
-    # Dataset selector
-    dataset_id = st.sidebar.selectbox(
-        "Select Dataset",
-        available_datasets,
-        help="Choose from configured datasets"
-    )
+    # Dataset selector - inside a form so browsing the list doesn't rerun
+    # the app; only Load/Reload submit the choice
+    with st.sidebar.form("dataset_form"):
+        dataset_id = st.selectbox(
+            "Select Dataset",
+            available_datasets,
+            help="Choose from configured datasets"
+        )
+        st.form_submit_button("📂 Load Dataset")
+        reload_requested = st.form_submit_button("🔄 Reload Dataset")
     
-    # Load button
-    if 'data_loaded' not in st.session_state or st.sidebar.button("🔄 Reload Dataset"):
-        with st.spinner(f"Loading {dataset_id}..."):
-            data = load_dataset(dataset_id, max_files=1)  # Start with 1 file for speed
-            
-            st.session_state.data = data
-            st.session_state.dataset_id = dataset_id
-            st.session_state.data_loaded = True
-            st.session_state.current_curve_idx = 0
-            st.session_state.fit_results = {}  # Store fit results
-            
+    # Reload drops the cached copy so files are re-read
+    if reload_requested:
+        _cached_load.clear()
+        _curve_arrays.clear()
+        _summary_metrics.clear()
+        _build_figure.clear()
+    
+    with st.spinner(f"Loading {dataset_id}..."):
+        data = _cached_load(dataset_id, 1)  # Start with 1 file for speed
+    
+    # Reset navigation and fits when switching datasets
+    if st.session_state.get('dataset_id') != dataset_id:
+        st.session_state.dataset_id = dataset_id
+        st.session_state.current_curve_idx = 0
         st.sidebar.success(f"✅ Loaded {len(data['curves'])} curves")
     
-    if 'data_loaded' in st.session_state and st.session_state.data_loaded:
-        data = st.session_state.data
-        
+    # (dataset_id, curve) pairs fitted this session - results live in the cache
+    if 'fitted_curves' not in st.session_state:
+        st.session_state.fitted_curves = set()
+    
+    if data['curves']:
         # Curve selector
         st.sidebar.markdown("---")
         st.sidebar.subheader("🔬 Curve Selection")
@@ -116,25 +313,18 @@ try:
         # Fit button
         if st.sidebar.button("Run RAP Fit", type="primary"):
             with st.spinner("Fitting RAP model..."):
-                time_data = data['time']
-                od_data = data['data'][curve_name].dropna().values
-                aligned_time = time_data[:len(od_data)]
-                
-                result = fit_rap_curve(aligned_time, od_data, curve_name=curve_name, verbose=False)
-                
-                # Store result in session state
-                if 'fit_results' not in st.session_state:
-                    st.session_state.fit_results = {}
-                st.session_state.fit_results[curve_name] = result
+                result = _fit_curve(dataset_id, data, curve_name)
+                st.session_state.fitted_curves.add((dataset_id, curve_name))
                 
             if result['success']:
                 st.sidebar.success("✅ Fit complete!")
             else:
                 st.sidebar.error(f"❌ Fit failed: {result.get('error', 'Unknown error')}")
         
-        # Show fit results if available
-        if 'fit_results' in st.session_state and curve_name in st.session_state.fit_results:
-            result = st.session_state.fit_results[curve_name]
+        # Show fit results if available (cache hit for curves already fitted)
+        result = None
+        if (dataset_id, curve_name) in st.session_state.fitted_curves:
+            result = _fit_curve(dataset_id, data, curve_name)
             
             if result['success']:
                 st.sidebar.markdown("### 📊 Fit Results")
@@ -180,96 +370,20 @@ try:
         with col3:
             st.metric("Time Points", len(data['time']))
         
-        # Get curve data
-        time_data = data['time']
-        od_data = data['data'][curve_name].values
-        
         # Plot with fits if available
         st.markdown("### 📈 Growth Curve")
         
-        fig = go.Figure()
-        
-        # Raw data points
-        fig.add_trace(go.Scatter(
-            x=time_data,
-            y=od_data,
-            mode='markers',
-            name='Data',
-            marker=dict(size=6, color='#3498db', opacity=0.6)
-        ))
-        
-        # Add fitted curves if available
-        if 'fit_results' in st.session_state and curve_name in st.session_state.fit_results:
-            result = st.session_state.fit_results[curve_name]
-            
-            if result['success']:
-                # RAP fit
-                fig.add_trace(go.Scatter(
-                    x=time_data[:len(result['sim_rap'])],
-                    y=result['sim_rap'],
-                    mode='lines',
-                    name='RAP Fit',
-                    line=dict(color='#e74c3c', width=3)
-                ))
-                
-                # Logistic fit (if available)
-                if result['sim_logistic'] is not None:
-                    fig.add_trace(go.Scatter(
-                        x=time_data[:len(result['sim_logistic'])],
-                        y=result['sim_logistic'],
-                        mode='lines',
-                        name='Logistic Fit',
-                        line=dict(color='#f39c12', width=2, dash='dash')
-                    ))
-                
-                # Add 85% line
-                K = result['K']
-                fig.add_hline(
-                    y=K * 0.85,
-                    line_dash="dot",
-                    line_color="green",
-                    annotation_text="85% Attractor",
-                    annotation_position="right"
-                )
-        
-        fig.update_layout(
-            xaxis_title="Time (hours)",
-            yaxis_title="OD600 / Population",
-            height=500,
-            hovermode='closest',
-            template='plotly_white',
-            showlegend=True
-        )
-        
+        fig = _build_figure(dataset_id, curve_name, result is not None, data)
         st.plotly_chart(fig, use_container_width=True)
         
         # Data summary
         st.markdown("### 📋 Data Summary")
         
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric("Initial OD", f"{od_data[0]:.3f}" if not np.isnan(od_data[0]) else "N/A")
-        
-        with col2:
-            max_val = np.nanmax(od_data)
-            st.metric("Max OD", f"{max_val:.3f}" if not np.isnan(max_val) else "N/A")
-        
-        with col3:
-            final_val = od_data[-1]
-            st.metric("Final OD", f"{final_val:.3f}" if not np.isnan(final_val) else "N/A")
-        
-        with col4:
-            if not np.isnan(od_data[0]) and od_data[0] > 0:
-                growth_ratio = final_val / od_data[0]
-                st.metric("Growth Ratio", f"{growth_ratio:.1f}x" if not np.isnan(growth_ratio) else "N/A")
-            else:
-                st.metric("Growth Ratio", "N/A")
+        for col, (label, text) in zip(st.columns(4), _summary_metrics(dataset_id, curve_name, data)):
+            col.metric(label, text)
         
         # Detailed comparison table if fit exists
-        if 'fit_results' in st.session_state and curve_name in st.session_state.fit_results:
-            result = st.session_state.fit_results[curve_name]
-            
+        if result is not None:
             if result['success']:
                 st.markdown("### 📊 Model Comparison")
                 
@@ -294,7 +408,9 @@ try:
                     ]
                 }
                 
-                st.table(pd.DataFrame(comparison_data))
+                # Values are pre-formatted strings; st.dataframe skips the
+                # server-side HTML (Styler) rendering st.table does
+                st.dataframe(pd.DataFrame(comparison_data), hide_index=True, use_container_width=True)
                 
                 # Verdict
                 if result['rap_better']:
@@ -313,7 +429,7 @@ try:
         """)
     
     else:
-        st.info("👆 Select a dataset from the sidebar to begin")
+        st.info("👆 No curves found in this dataset - select another from the sidebar")
 
 except Exception as e:
     st.error(f"Error: {str(e)}")
@@ -22,7 +22,7 @@ import os
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from core.automated_processor import AutomatedRAPProcessor
+from core.automated_processor import AutomatedRAPProcessor, default_n_workers
 from core.universal_loader import list_datasets
 
 
@@ -62,7 +62,7 @@ Examples:
     parser.add_argument(
         '--workers',
         type=int,
-        help='Number of parallel workers (default: CPU count - 1)'
+        help='Number of parallel workers (default: available CPUs - 1)'
     )
     
     parser.add_argument(
@@ -101,8 +101,9 @@ Examples:
     if args.limit:
         print(f"Limit: {args.limit} curves")
     
-    if args.workers:
-        print(f"Workers: {args.workers}")
+    # Respect CPU affinity / container quota rather than the host core count
+    n_workers = args.workers or default_n_workers()
+    print(f"Workers: {n_workers}")
     
     print("="*70 + "\n")
     
@@ -114,7 +115,7 @@ Examples:
         summary = processor.process_dataset(
             dataset_id=args.dataset,
             max_curves=args.limit,
-            n_workers=args.workers,
+            n_workers=n_workers,
             resume=not args.no_resume
         )
         
@@ -44,13 +44,13 @@ echo STEP 3: Validation
 echo ========================================
 echo.
 
-if exist "datasets\cancer\hl60_processed.xlsx" (
+if exist "datasets\cancer\hl60_processed.parquet" (
     echo ✅ HL-60 dataset ready
 ) else (
     echo ⚠️  HL-60 dataset not found
 )
 
-if exist "datasets\cancer\depmap_processed.csv" (
+if exist "datasets\cancer\depmap_processed.parquet" (
     echo ✅ DepMap dataset ready
 ) else (
     echo ⚠️  DepMap dataset not found
@@ -1,30 +1,34 @@
 """
 Quick diagnostic to check Excel columns
 """
-import pandas as pd
+from openpyxl import load_workbook
 
 file_path = r"datasets\biological\ecoli_data\BW25113_Growth_Round01.xlsx"
 
-print("Reading Excel file...")
-df = pd.read_excel(file_path)
+print("Reading Excel header...")
+# Read-only mode streams rows, so only the header row is parsed
+wb = load_workbook(file_path, read_only=True, data_only=True)
+header = next(wb.active.iter_rows(min_row=1, max_row=1, values_only=True), ())
+wb.close()
+columns = [col if col is not None else f"Unnamed: {i}" for i, col in enumerate(header)]
 
-print(f"\nTotal columns: {len(df.columns)}")
+print(f"\nTotal columns: {len(columns)}")
 print(f"\nFirst 20 column names:")
-for i, col in enumerate(df.columns[:20], 1):
+for i, col in enumerate(columns[:20], 1):
     print(f"  {i}. {col}")
 
 print(f"\nColumn names containing 'time' (case-insensitive):")
-time_cols = [col for col in df.columns if 'time' in str(col).lower()]
+time_cols = [col for col in columns if 'time' in str(col).lower()]
 print(time_cols if time_cols else "  None found")
 
 print(f"\nColumn names containing 'OD' (case-sensitive):")
-od_cols = [col for col in df.columns if 'OD' in str(col)]
+od_cols = [col for col in columns if 'OD' in str(col)]
 print(od_cols if od_cols else "  None found")
 
 print(f"\nColumn names containing 'od' (case-insensitive):")
-od_cols_lower = [col for col in df.columns if 'od' in str(col).lower()]
+od_cols_lower = [col for col in columns if 'od' in str(col).lower()]
 print(od_cols_lower if od_cols_lower else "  None found")
 
 print(f"\nAll column names:")
-for col in df.columns:
+for col in columns:
     print(f"  '{col}'")
@@ -11,9 +11,12 @@ Date: November 2025
 """
 
 import urllib.request
-import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+CHUNK_SIZE = 1 << 20  # 1 MB copy buffer
+
 # Create data directories
 base_dir = Path("datasets/cancer")
 base_dir.mkdir(parents=True, exist_ok=True)
@@ -40,6 +43,26 @@ datasets = {
     }
 }
 
+def _fetch(info, output_path):
+    """Stream one file to disk, resuming a partial download when possible."""
+    part_path = output_path.with_name(output_path.name + '.part')
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    
+    request = urllib.request.Request(info['url'])
+    if offset:
+        request.add_header('Range', f'bytes={offset}-')
+    
+    with urllib.request.urlopen(request, timeout=60) as response:
+        # Server ignored the range - start over
+        mode = 'ab' if offset and response.status == 206 else 'wb'
+        with open(part_path, mode) as f:
+            shutil.copyfileobj(response, f, length=CHUNK_SIZE)
+    
+    part_path.replace(output_path)
+    return output_path.stat().st_size / 1024
+
+
+pending = {}
 for name, info in datasets.items():
     print(f"\n{name}")
     print("-" * 70)
@@ -54,16 +77,26 @@ for name, info in datasets.items():
     
     print(f"📥 Downloading from: {info['url']}")
     print(f"   Saving to: {output_path}")
-    
-    try:
-        urllib.request.urlretrieve(info['url'], output_path)
-        size = output_path.stat().st_size / 1024
-        print(f"✅ Downloaded successfully! ({size:.1f} KB)")
+    pending[name] = (info, output_path)
+
+# Downloads are I/O-bound, so run them side by side
+if pending:
+    print(f"\n⏳ Downloading {len(pending)} file(s) in parallel...")
+    with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+        futures = {executor.submit(_fetch, info, output_path): name
+                   for name, (info, output_path) in pending.items()}
         
-    except Exception as e:
-        print(f"❌ Download failed: {str(e)}")
-        print(f"   Manual download: {info['url']}")
-        print(f"   Save as: {output_path}")
+        for future in as_completed(futures):
+            name = futures[future]
+            info, output_path = pending[name]
+            try:
+                size = future.result()
+                print(f"✅ {name}: downloaded successfully! ({size:.1f} KB)")
+                
+            except Exception as e:
+                print(f"❌ {name}: download failed: {str(e)}")
+                print(f"   Manual download: {info['url']}")
+                print(f"   Save as: {output_path}")
 
 print("\n" + "="*70)
 print("DOWNLOAD SUMMARY")
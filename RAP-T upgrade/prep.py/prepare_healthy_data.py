@@ -15,123 +15,192 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 import glob
-
-print("="*70)
-print("HEALTHY CELL DATA PREPARATION")
-print("="*70)
-
-healthy_dir = Path("datasets/healthy_cells")
-healthy_dir.mkdir(parents=True, exist_ok=True)
-
-# Find all data files
-csv_files = list(healthy_dir.glob("*.csv"))
-excel_files = list(healthy_dir.glob("*.xlsx")) + list(healthy_dir.glob("*.xls"))
-
-all_files = csv_files + excel_files
-
-if not all_files:
-    print("\n⚠️  No data files found in datasets/healthy_cells/")
-    print("\nPlease download healthy cell growth data and place it here:")
-    print("  - MCF-10A growth curves (normal breast)")
-    print("  - MRC-5 growth curves (lung fibroblasts)")
-    print("  - Other normal cell lines")
-    print("\nSee SEARCH_GUIDE.txt for download instructions")
-    print("="*70)
-    exit()
-
-print(f"\nFound {len(all_files)} file(s) to process:")
-for f in all_files:
-    print(f"  - {f.name}")
-
-print("\n" + "="*70)
-
-processed_count = 0
-
-for filepath in all_files:
-    print(f"\nProcessing: {filepath.name}")
-    print("-" * 70)
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+try:
+    import python_calamine  # noqa: F401 - only needed as a read_excel engine
+    # pandas only accepts engine='calamine' from 2.2 on
+    _pandas_version = tuple(int(part) for part in pd.__version__.split('.')[:2])
+    _XLSX_ENGINE = 'calamine' if _pandas_version >= (2, 2) else None
+except ImportError:
+    _XLSX_ENGINE = None  # pandas default (openpyxl)
+
+# Processed tables are written as zstd Parquet (fast, typed, small);
+# set to "xlsx" if a downstream tool needs Excel
+OUTPUT_FORMAT = "parquet"
+
+# Raw input formats picked up from datasets/healthy_cells/
+INPUT_SUFFIXES = {'.csv', '.xlsx', '.xls'}
+
+# Column names that mark the time axis
+TIME_COLUMN_PATTERN = re.compile(r"time|day|hour", re.IGNORECASE)
+
+# Rows read up front to pick the time/measurement columns before the full read
+SAMPLE_ROWS = 200
+
+def _is_measure_dtype(dtype):
+    """Any int/float width counts as a measurement; bools don't."""
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+def process_one(filepath, healthy_dir):
+    """
+    Convert one raw file into a RAP-ready table.
+    
+    Runs in a worker process, so progress is collected rather than
+    printed; the parent prints each file's log in order.
+    
+    Returns:
+    --------
+    tuple
+        (success, list of log lines)
+    """
+    log = [f"\nProcessing: {filepath.name}", "-" * 70]
     
     try:
-        # Read file
-        if filepath.suffix == '.csv':
-            df = pd.read_csv(filepath)
+        # Read a short sample first; the full read then parses only the
+        # time column and the sample's numeric columns
+        if filepath.suffix.lower() == '.csv':
+            read = pd.read_csv
         else:
-            df = pd.read_excel(filepath)
+            # Rust-backed calamine streams .xlsx cells; .xls stays on xlrd
+            engine = _XLSX_ENGINE if filepath.suffix.lower() in ('.xlsx', '.xlsb') else None
+            read = partial(pd.read_excel, engine=engine)
         
-        print(f"  Loaded: {len(df)} rows, {len(df.columns)} columns")
-        print(f"  Columns: {list(df.columns[:10])}" + ("..." if len(df.columns) > 10 else ""))
+        sample = read(filepath, nrows=SAMPLE_ROWS)
+        columns = sample.columns
         
-        # Try to identify time and measurement columns
-        time_col = None
-        for col in df.columns:
-            if any(term in str(col).lower() for term in ['time', 'day', 'hour']):
-                time_col = col
-                break
+        # Try to identify time and measurement columns (first regex match wins)
+        is_time = columns.astype(str).str.contains(TIME_COLUMN_PATTERN)
+        time_col = columns[is_time.argmax()] if is_time.any() else None
         
-        if time_col:
-            print(f"  Time column: '{time_col}'")
-        else:
-            print(f"  ⚠️  No time column detected - you may need to manually specify")
-            continue
+        if time_col is not None:
+            keep = [i for i, (col, dtype) in enumerate(sample.dtypes.items())
+                    if col == time_col or _is_measure_dtype(dtype)]
+            del sample
+            df = read(filepath, usecols=keep)
+            log.append(f"  Loaded: {len(df)} rows, {len(columns)} columns")
         
-        # Find measurement columns (everything except time)
-        measure_cols = [col for col in df.columns if col != time_col]
+        log.append(f"  Columns: {list(columns[:10])}" + ("..." if len(columns) > 10 else ""))
         
-        # Filter for numeric columns
-        measure_cols = [col for col in measure_cols if df[col].dtype in ['int64', 'float64']]
+        if time_col is not None:
+            log.append(f"  Time column: '{time_col}'")
+        else:
+            log.append(f"  ⚠️  No time column detected - you may need to manually specify")
+            return False, log
         
-        print(f"  Measurement columns: {len(measure_cols)}")
+        # Numeric measurement columns (everything except time); a column that
+        # looked numeric in the sample but has text further down is dropped
+        measure_cols = [
+            col for col, dtype in df.dtypes.items()
+            if col != time_col and _is_measure_dtype(dtype)
+        ]
+        
+        log.append(f"  Measurement columns: {len(measure_cols)}")
         if measure_cols:
-            print(f"    Examples: {measure_cols[:5]}")
+            log.append(f"    Examples: {measure_cols[:5]}")
         
         if not measure_cols:
-            print(f"  ⚠️  No measurement columns found")
-            continue
+            log.append(f"  ⚠️  No measurement columns found")
+            return False, log
         
-        # Create standardized output
-        output_df = df[[time_col] + measure_cols].copy()
+        # Create standardized output; the projected read already owns its
+        # columns, so no copy is needed - just move time to the front
+        output_df = df
+        if len(measure_cols) + 1 < len(output_df.columns):
+            output_df = output_df.drop(columns=[col for col in output_df.columns
+                                                if col != time_col and col not in measure_cols])
         
         # Rename time column to standard
-        output_df.rename(columns={time_col: 'Time (h)'}, inplace=True)
+        output_df.insert(0, 'Time (h)', output_df.pop(time_col))
         
-        # Save as Excel for RAP
-        output_name = filepath.stem + "_processed.xlsx"
+        # Save for RAP
+        output_name = filepath.stem + f"_processed.{OUTPUT_FORMAT}"
         output_path = healthy_dir / output_name
         
-        output_df.to_excel(output_path, index=False)
+        if OUTPUT_FORMAT == "parquet":
+            output_df.columns = output_df.columns.astype(str)  # Parquet needs string names
+            output_df.to_parquet(output_path, index=False, compression='zstd')
+        else:
+            output_df.to_excel(output_path, index=False)
         
-        print(f"  ✅ Saved to: {output_path.name}")
-        print(f"     Format: Time + {len(measure_cols)} growth curve(s)")
+        log.append(f"  ✅ Saved to: {output_path.name}")
+        log.append(f"     Format: Time + {len(measure_cols)} growth curve(s)")
         
-        processed_count += 1
+        return True, log
         
     except Exception as e:
-        print(f"  ❌ Error: {str(e)}")
-        continue
+        log.append(f"  ❌ Error: {str(e)}")
+        return False, log
 
-print("\n" + "="*70)
-print("PROCESSING SUMMARY")
-print("="*70)
 
-print(f"\nProcessed: {processed_count}/{len(all_files)} files")
 
-processed_files = list(healthy_dir.glob("*_processed.xlsx"))
-
-if processed_files:
-    print(f"\nReady for RAP analysis:")
-    for f in processed_files:
-        print(f"  ✅ {f.name}")
+def main():
+    print("="*70)
+    print("HEALTHY CELL DATA PREPARATION")
+    print("="*70)
+    
+    healthy_dir = Path("datasets/healthy_cells")
+    healthy_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Find all data files in one directory pass (suffix match is case-insensitive)
+    with os.scandir(healthy_dir) as it:
+        all_files = sorted(
+            Path(e.path) for e in it
+            if e.is_file() and Path(e.name).suffix.lower() in INPUT_SUFFIXES
+        )
+    
+    if not all_files:
+        print("\n⚠️  No data files found in datasets/healthy_cells/")
+        print("\nPlease download healthy cell growth data and place it here:")
+        print("  - MCF-10A growth curves (normal breast)")
+        print("  - MRC-5 growth curves (lung fibroblasts)")
+        print("  - Other normal cell lines")
+        print("\nSee SEARCH_GUIDE.txt for download instructions")
+        print("="*70)
+        return
+    
+    print(f"\nFound {len(all_files)} file(s) to process:")
+    for f in all_files:
+        print(f"  - {f.name}")
     
     print("\n" + "="*70)
-    print("NEXT STEPS")
+    
+    # Files are independent - fan out one worker per file
+    n_workers = max(1, min(len(all_files), os.cpu_count() or 1))
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        results = list(executor.map(process_one, all_files, [healthy_dir] * len(all_files)))
+    
+    for ok, log in results:
+        print("\n".join(log))
+    
+    processed_count = sum(ok for ok, _ in results)
+    
+    print("\n" + "="*70)
+    print("PROCESSING SUMMARY")
     print("="*70)
-    print("""
+    
+    print(f"\nProcessed: {processed_count}/{len(all_files)} files")
+    
+    processed_files = list(healthy_dir.glob(f"*_processed.{OUTPUT_FORMAT}"))
+    
+    if processed_files:
+        print(f"\nReady for RAP analysis:")
+        for f in processed_files:
+            print(f"  ✅ {f.name}")
+    
+        print("\n" + "="*70)
+        print("NEXT STEPS")
+        print("="*70)
+        print("""
 1. Add to config/datasets.json:
    
    "mcf10a_healthy": {
      "name": "MCF-10A Normal Breast Cells",
      "organism": "Human mammary epithelial (normal)",
-     "file_pattern": "mcf10a_*_processed.xlsx",
+     "file_pattern": "mcf10a_*_processed.parquet",
      "data_directory": "datasets/healthy_cells",
      "time_column_patterns": ["Time"],
      "od_column_patterns": ["Cell", "Count", "OD"],
@@ -148,10 +217,14 @@ if processed_files:
    
 4. Run batch analysis:
    python run_rap.py mcf10a_healthy
-    """)
-else:
-    print("\n⚠️  No files successfully processed")
-    print("\nCheck the error messages above")
-    print("You may need to manually format the data")
+        """)
+    else:
+        print("\n⚠️  No files successfully processed")
+        print("\nCheck the error messages above")
+        print("You may need to manually format the data")
+    
+    print("="*70)
+
 
-print("="*70)
+if __name__ == "__main__":
+    main()
@@ -16,13 +16,39 @@ Date: November 2025
 
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # figures are only saved to disk, never shown
 import matplotlib.pyplot as plt
 from pathlib import Path
 import sys
+import gc
+import hashlib
+import json
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+try:
+    import pyarrow  # noqa: F401 - read_csv engine and Parquet cache backend
+    _CSV_ENGINE = 'pyarrow'
+    _HAVE_PYARROW = True
+except ImportError:
+    _CSV_ENGINE = 'c'
+    _HAVE_PYARROW = False
+
+RESULTS_FILE = Path(__file__).parent.parent / "results" / "raw" / "full_scale_rap_results_n12547.parquet"
+if not RESULTS_FILE.exists():
+    RESULTS_FILE = RESULTS_FILE.with_suffix('.csv')  # runs from before the Parquet output
+OUTPUT_DIR = Path(__file__).parent.parent / "results" / "raw" / "outlier_analysis"
+CACHE_DIR = OUTPUT_DIR / "cache"
+
+# Columns the analysis actually reads; everything else is skipped at parse time
+NEEDED_COLS = ['curve', 'converged_85', 'final_util', 'distance_85',
+               'sse_rap', 'sse_logistic', 'r', 'd', 'K']
+
+# Metrics are reported to 3 decimals, well within float32's ~7 significant digits
+FLOAT32_COLS = ['final_util', 'distance_85', 'sse_rap', 'sse_logistic', 'r', 'd', 'K']
+
 def load_data():
     """Load results and identify outliers."""
     print("="*70)
@@ -30,14 +56,24 @@ def load_data():
     print("="*70)
     
     # Load main results
-    results_file = Path(__file__).parent.parent / "results" / "raw" / "full_scale_rap_results_n12547.csv"
+    results_file = RESULTS_FILE
     
     if not results_file.exists():
         print(f"\n❌ Results file not found: {results_file}")
-        return None, None, None
+        return None, None, None, None
     
     print(f"\n📂 Loading: {results_file.name}")
-    df = pd.read_csv(results_file)
+    if results_file.suffix == '.parquet':
+        import pyarrow.parquet as pq
+        header = pq.read_schema(results_file).names
+    else:
+        header = pd.read_csv(results_file, nrows=0).columns
+    usecols = [col for col in NEEDED_COLS if col in header]
+    dtypes = {col: 'float32' for col in FLOAT32_COLS if col in usecols}
+    if results_file.suffix == '.parquet':
+        df = pd.read_parquet(results_file, columns=usecols).astype(dtypes)
+    else:
+        df = pd.read_csv(results_file, usecols=usecols, dtype=dtypes, engine=_CSV_ENGINE)
     
     # Identify outliers
     outliers = df[df['converged_85'] == False].copy()
@@ -48,10 +84,70 @@ def load_data():
     print(f"   Converged to 85%: {len(convergers):,} ({len(convergers)/len(df)*100:.1f}%)")
     print(f"   Outliers: {len(outliers):,} ({len(outliers)/len(df)*100:.2f}%)")
     
-    return df, outliers, convergers
+    # Only the scatter axis limit needs the full table once the split is done
+    max_sse = float(max(df['sse_logistic'].max(), df['sse_rap'].max()))
+    
+    return df, outliers, convergers, max_sse
+
 
+def _cache_key(results_file):
+    """Key derived from the results file's size and mtime; changes whenever the CSV does."""
+    st = Path(results_file).stat()
+    return hashlib.blake2b(f"{st.st_size}-{st.st_mtime_ns}".encode()).hexdigest()[:16]
 
-def compare_statistics(outliers, convergers):
+
+def load_cached_analysis(results_file):
+    """
+    Load the derived tables of a previous run on the same results file.
+    
+    Returns:
+    --------
+    tuple or None
+        (outliers, convergers, categories, stats, max_sse, n_total), or None
+        when there is no cache entry for the current file
+    """
+    if not _HAVE_PYARROW or not Path(results_file).exists():
+        return None
+    
+    key = _cache_key(results_file)
+    meta_file = CACHE_DIR / f"{key}_analysis.json"
+    if not meta_file.exists():
+        return None
+    
+    meta = json.loads(meta_file.read_text(encoding='utf-8'))
+    outliers = pd.read_parquet(CACHE_DIR / f"{key}_outliers.parquet")
+    convergers = pd.read_parquet(CACHE_DIR / f"{key}_convergers.parquet")
+    
+    print(f"\n♻️  Reusing cached analysis ({key}) for {Path(results_file).name}")
+    print(f"   Total curves: {meta['n_total']:,}")
+    print(f"   Outliers: {len(outliers):,}")
+    
+    return (outliers, convergers, meta['categories'], meta['stats'],
+            meta['max_sse'], meta['n_total'])
+
+
+def save_cached_analysis(results_file, outliers, convergers, categories, stats, max_sse, n_total):
+    """Store the derived tables so the next run can skip parsing and categorization."""
+    if not _HAVE_PYARROW:
+        return
+    
+    key = _cache_key(results_file)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    outliers.to_parquet(CACHE_DIR / f"{key}_outliers.parquet")
+    convergers.to_parquet(CACHE_DIR / f"{key}_convergers.parquet")
+    
+    # The JSON file is written last, so its presence marks a complete entry
+    meta = {
+        'categories': categories,
+        'stats': {metric: {name: float(value) for name, value in s.items()}
+                  for metric, s in stats.items()},
+        'max_sse': max_sse,
+        'n_total': n_total,
+    }
+    (CACHE_DIR / f"{key}_analysis.json").write_text(json.dumps(meta), encoding='utf-8')
+
+
+def compare_statistics(df):
     """Compare outliers vs convergers statistically."""
     print(f"\n{'='*70}")
     print("📈 STATISTICAL COMPARISON")
@@ -69,15 +165,21 @@ def compare_statistics(outliers, convergers):
     
     results = {}
     
+    # One grouped pass for every metric; rows are convergers (True) / outliers (False)
+    present = [metric for metric in metrics if metric in df.columns]
+    agg = (df.groupby('converged_85')[present]
+             .agg(['mean', 'std', 'median'])
+             .reindex([True, False]))
+    
     for metric, label in metrics.items():
-        if metric in outliers.columns and metric in convergers.columns:
-            conv_mean = convergers[metric].mean()
-            conv_std = convergers[metric].std()
-            conv_med = convergers[metric].median()
+        if metric in present:
+            conv_mean = agg.loc[True, (metric, 'mean')]
+            conv_std = agg.loc[True, (metric, 'std')]
+            conv_med = agg.loc[True, (metric, 'median')]
             
-            out_mean = outliers[metric].mean()
-            out_std = outliers[metric].std()
-            out_med = outliers[metric].median()
+            out_mean = agg.loc[False, (metric, 'mean')]
+            out_std = agg.loc[False, (metric, 'std')]
+            out_med = agg.loc[False, (metric, 'median')]
             
             diff = abs(conv_mean - out_mean)
             
@@ -89,6 +191,7 @@ def compare_statistics(outliers, convergers):
             results[metric] = {
                 'conv_mean': conv_mean,
                 'conv_std': conv_std,
+                'conv_median': conv_med,
                 'out_mean': out_mean,
                 'out_std': out_std,
                 'difference': diff
@@ -111,31 +214,37 @@ def categorize_outliers(outliers, convergers):
         'uncategorized': []
     }
     
-    # Calculate thresholds
-    median_rap_sse = convergers['sse_rap'].median()
-    median_log_sse = convergers['sse_logistic'].median()
+    # Calculate thresholds (reusing medians compare_statistics stored, if any)
+    median_rap_sse = convergers.attrs.get('median_sse_rap')
+    if median_rap_sse is None:
+        median_rap_sse = convergers['sse_rap'].median()
+    median_log_sse = convergers.attrs.get('median_sse_logistic')
+    if median_log_sse is None:
+        median_log_sse = convergers['sse_logistic'].median()
     
     print(f"\nThresholds:")
     print(f"   Median RAP SSE (convergers): {median_rap_sse:.3f}")
     print(f"   Median Logistic SSE (convergers): {median_log_sse:.3f}")
     
-    for idx, row in outliers.iterrows():
-        curve_name = row['curve']
-        
-        # High noise: SSE much higher than typical
-        if row['sse_rap'] > 5 * median_rap_sse:
-            categories['high_noise'].append(curve_name)
-        # Poor quality: Both models struggled
-        elif row['sse_logistic'] > 5 * median_log_sse:
-            categories['low_quality'].append(curve_name)
-        # Extreme values
-        elif row['final_util'] > 1.1 or row['final_util'] < 0.5:
-            categories['extreme_values'].append(curve_name)
-        # Just didn't converge to 85%
-        elif row['distance_85'] > 0.1:
-            categories['poor_convergence'].append(curve_name)
-        else:
-            categories['uncategorized'].append(curve_name)
+    # Classify every outlier at once; np.select applies the conditions in
+    # priority order, like an if/elif chain
+    sse_rap = outliers['sse_rap'].to_numpy()
+    sse_log = outliers['sse_logistic'].to_numpy()
+    final_util = outliers['final_util'].to_numpy()
+    distance_85 = outliers['distance_85'].to_numpy()
+    
+    conditions = [
+        sse_rap > 5 * median_rap_sse,                 # High noise: SSE much higher than typical
+        sse_log > 5 * median_log_sse,                 # Poor quality: Both models struggled
+        (final_util > 1.1) | (final_util < 0.5),      # Extreme values
+        distance_85 > 0.1,                            # Just didn't converge to 85%
+    ]
+    choices = ['high_noise', 'low_quality', 'extreme_values', 'poor_convergence']
+    labels = np.select(conditions, choices, default='uncategorized')
+    
+    curve_names = outliers['curve'].to_numpy()
+    for cat in categories:
+        categories[cat] = curve_names[labels == cat].tolist()
     
     print(f"\n📊 Categories:")
     for cat, curves in categories.items():
@@ -153,7 +262,7 @@ def categorize_outliers(outliers, convergers):
     return categories
 
 
-def create_visualizations(df, outliers, convergers, output_dir):
+def create_visualizations(max_sse, outliers, convergers, output_dir):
     """Create comparison plots."""
     print(f"\n{'='*70}")
     print("📊 CREATING VISUALIZATIONS")
@@ -162,9 +271,8 @@ def create_visualizations(df, outliers, convergers, output_dir):
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Plot 1: Distribution Comparisons
-    fig, axes = plt.subplots(2, 3, figsize=(15, 10))
-    fig.suptitle('Outliers vs Convergers: Statistical Comparison', fontsize=16, fontweight='bold')
+    # Let Agg merge near-collinear path segments when rendering
+    plt.rcParams['path.simplify_threshold'] = 1.0
     
     metrics = [
         ('final_util', 'Final Utilization'),
@@ -175,13 +283,28 @@ def create_visualizations(df, outliers, convergers, output_dir):
         ('K', 'Carrying Capacity (K)')
     ]
     
+    # Materialize each column once as a NumPy array for all plots below
+    columns = [metric for metric, _ in metrics] + ['distance_85']
+    conv = {col: convergers[col].to_numpy() for col in columns}
+    out = {col: outliers[col].to_numpy() for col in columns}
+    
+    # One figure is reused for both plots; constrained layout replaces tight_layout
+    fig = plt.figure(figsize=(15, 10), constrained_layout=True)
+    
+    # Plot 1: Distribution Comparisons
+    axes = fig.subplots(2, 3)
+    fig.suptitle('Outliers vs Convergers: Statistical Comparison', fontsize=16, fontweight='bold')
+    
     for idx, (metric, label) in enumerate(metrics):
         ax = axes[idx // 3, idx % 3]
         
-        # Plot distributions
-        ax.hist(convergers[metric], bins=30, alpha=0.6, color='green', 
+        # Plot distributions on shared bin edges so the overlays line up
+        values = np.concatenate([conv[metric], out[metric]])
+        values = values[np.isfinite(values)]
+        edges = np.histogram_bin_edges(values, bins=30) if values.size else 30
+        ax.hist(conv[metric], bins=edges, alpha=0.6, color='green', 
                 label=f'Convergers (n={len(convergers)})', density=True)
-        ax.hist(outliers[metric], bins=15, alpha=0.8, color='red',
+        ax.hist(out[metric], bins=edges, alpha=0.8, color='red',
                 label=f'Outliers (n={len(outliers)})', density=True)
         
         ax.set_xlabel(label)
@@ -190,23 +313,22 @@ def create_visualizations(df, outliers, convergers, output_dir):
         ax.legend()
         ax.grid(alpha=0.3)
     
-    plt.tight_layout()
     plot_path = output_dir / 'outlier_comparison_distributions.png'
-    plt.savefig(plot_path, dpi=150, bbox_inches='tight')
+    fig.savefig(plot_path, dpi=150, bbox_inches='tight')
     print(f"   ✅ Saved: {plot_path.name}")
-    plt.close()
     
     # Plot 2: Scatter plots
-    fig, axes = plt.subplots(1, 2, figsize=(12, 5))
+    fig.clear()
+    fig.set_size_inches(12, 5)
+    axes = fig.subplots(1, 2)
     fig.suptitle('Outlier Characteristics', fontsize=14, fontweight='bold')
     
     # SSE comparison
     ax = axes[0]
-    ax.scatter(convergers['sse_logistic'], convergers['sse_rap'], 
-               alpha=0.3, s=10, c='green', label='Convergers')
-    ax.scatter(outliers['sse_logistic'], outliers['sse_rap'],
-               alpha=0.8, s=50, c='red', marker='x', label='Outliers')
-    max_sse = max(df['sse_logistic'].max(), df['sse_rap'].max())
+    ax.scatter(conv['sse_logistic'], conv['sse_rap'], 
+               alpha=0.3, s=10, c='green', label='Convergers', rasterized=True)
+    ax.scatter(out['sse_logistic'], out['sse_rap'],
+               alpha=0.8, s=50, c='red', marker='x', label='Outliers', rasterized=True)
     ax.plot([0, max_sse], [0, max_sse], 'k--', alpha=0.3)
     ax.set_xlabel('Logistic SSE')
     ax.set_ylabel('RAP SSE')
@@ -216,10 +338,10 @@ def create_visualizations(df, outliers, convergers, output_dir):
     
     # Final utilization vs distance
     ax = axes[1]
-    ax.scatter(convergers['final_util'], convergers['distance_85'],
-               alpha=0.3, s=10, c='green', label='Convergers')
-    ax.scatter(outliers['final_util'], outliers['distance_85'],
-               alpha=0.8, s=50, c='red', marker='x', label='Outliers')
+    ax.scatter(conv['final_util'], conv['distance_85'],
+               alpha=0.3, s=10, c='green', label='Convergers', rasterized=True)
+    ax.scatter(out['final_util'], out['distance_85'],
+               alpha=0.8, s=50, c='red', marker='x', label='Outliers', rasterized=True)
     ax.axvline(0.85, color='purple', linestyle='--', linewidth=2, alpha=0.5, label='85% Target')
     ax.axhline(0.05, color='orange', linestyle='--', linewidth=1, alpha=0.5, label='5% Tolerance')
     ax.set_xlabel('Final Utilization')
@@ -228,20 +350,20 @@ def create_visualizations(df, outliers, convergers, output_dir):
     ax.legend()
     ax.grid(alpha=0.3)
     
-    plt.tight_layout()
     plot_path = output_dir / 'outlier_scatter_analysis.png'
-    plt.savefig(plot_path, dpi=150, bbox_inches='tight')
+    fig.savefig(plot_path, dpi=150, bbox_inches='tight')
     print(f"   ✅ Saved: {plot_path.name}")
-    plt.close()
+    plt.close(fig)
 
 
-def generate_report(df, outliers, convergers, categories, stats, output_file):
+def generate_report(n_total, outliers, convergers, categories, stats, output_file):
     """Generate markdown report."""
     print(f"\n{'='*70}")
     print("📝 GENERATING REPORT")
     print(f"{'='*70}")
     
-    report = f"""# E. coli Outlier Analysis Report
+    # Collect the report in pieces and join once at the end
+    parts = [f"""# E. coli Outlier Analysis Report
 
 **Date:** {pd.Timestamp.now().strftime('%Y-%m-%d')}  
 **Dataset:** Aida et al. (2025) - E. coli BW25113 growth curves
@@ -250,28 +372,27 @@ def generate_report(df, outliers, convergers, categories, stats, output_file):
 
 ## Summary Statistics
 
-- **Total curves analyzed:** {len(df):,}
-- **Converged to 85%:** {len(convergers):,} ({len(convergers)/len(df)*100:.2f}%)
-- **Outliers (non-convergent):** {len(outliers):,} ({len(outliers)/len(df)*100:.2f}%)
+- **Total curves analyzed:** {n_total:,}
+- **Converged to 85%:** {len(convergers):,} ({len(convergers)/n_total*100:.2f}%)
+- **Outliers (non-convergent):** {len(outliers):,} ({len(outliers)/n_total*100:.2f}%)
 
 ---
 
 ## Outlier Categories
 
-"""
+"""]
     
     for cat, curves in categories.items():
         if curves:
             pct = len(curves) / len(outliers) * 100
-            report += f"### {cat.replace('_', ' ').title()}\n"
-            report += f"- **Count:** {len(curves)} curves ({pct:.1f}% of outliers)\n"
+            parts.append(f"### {cat.replace('_', ' ').title()}\n"
+                         f"- **Count:** {len(curves)} curves ({pct:.1f}% of outliers)\n")
             if len(curves) <= 5:
-                report += "- **Examples:**\n"
-                for curve in curves:
-                    report += f"  - `{curve}`\n"
-            report += "\n"
+                parts.append("- **Examples:**\n")
+                parts.extend(f"  - `{curve}`\n" for curve in curves)
+            parts.append("\n")
     
-    report += f"""---
+    parts.append("""---
 
 ## Statistical Comparison
 
@@ -279,7 +400,7 @@ def generate_report(df, outliers, convergers, categories, stats, output_file):
 
 | Metric | Convergers (mean ± std) | Outliers (mean ± std) | Difference |
 |--------|------------------------|---------------------|------------|
-"""
+""")
     
     metrics_labels = {
         'final_util': 'Final Utilization',
@@ -293,10 +414,10 @@ def generate_report(df, outliers, convergers, categories, stats, output_file):
     for metric, label in metrics_labels.items():
         if metric in stats:
             s = stats[metric]
-            report += f"| {label} | {s['conv_mean']:.3f} ± {s['conv_std']:.3f} | "
-            report += f"{s['out_mean']:.3f} ± {s['out_std']:.3f} | {s['difference']:.3f} |\n"
+            parts.append(f"| {label} | {s['conv_mean']:.3f} ± {s['conv_std']:.3f} | "
+                         f"{s['out_mean']:.3f} ± {s['out_std']:.3f} | {s['difference']:.3f} |\n")
     
-    report += f"""
+    parts.append(f"""
 
 ---
 
@@ -312,8 +433,8 @@ def generate_report(df, outliers, convergers, categories, stats, output_file):
    vs {stats['final_util']['conv_mean']:.2%} for convergers, with much higher variability
    (std: {stats['final_util']['out_std']:.3f} vs {stats['final_util']['conv_std']:.3f}).
 
-3. **Model selectivity demonstrated:** The fact that RAP rejects {len(outliers)/len(df)*100:.2f}%
-   of curves while successfully fitting {len(convergers)/len(df)*100:.1f}% proves the model
+3. **Model selectivity demonstrated:** The fact that RAP rejects {len(outliers)/n_total*100:.2f}%
+   of curves while successfully fitting {len(convergers)/n_total*100:.1f}% proves the model
    discriminates true biological signal from noise/artifacts.
 
 ### Conclusion
@@ -343,37 +464,53 @@ while correctly rejecting corrupted or physiologically compromised data.**
 - `outlier_scatter_analysis.png` - Scatter plot comparisons
 - `OUTLIER_ANALYSIS_REPORT.md` - This report
 
-"""
+""")
     
     output_path = Path(output_file)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(report)
+    output_path.write_text("".join(parts), encoding='utf-8')
     
     print(f"   ✅ Report saved: {output_path.name}")
     print(f"   📂 Location: {output_path.parent}")
 
 
 if __name__ == "__main__":
-    # Load data
-    df, outliers, convergers = load_data()
-    
-    if df is None:
-        print("\n❌ Could not load data. Exiting.")
-        sys.exit(1)
+    cached = load_cached_analysis(RESULTS_FILE)
     
-    # Statistical comparison
-    stats = compare_statistics(outliers, convergers)
-    
-    # Categorize outliers
-    categories = categorize_outliers(outliers, convergers)
+    if cached is not None:
+        outliers, convergers, categories, stats, max_sse, n_total = cached
+    else:
+        # Load data
+        df, outliers, convergers, max_sse = load_data()
+        
+        if df is None:
+            print("\n❌ Could not load data. Exiting.")
+            sys.exit(1)
+        
+        # Statistical comparison
+        stats = compare_statistics(df)
+        
+        # The full table is no longer needed; drop it before plotting and reporting
+        n_total = len(df)
+        del df
+        gc.collect()
+        
+        # Medians were already computed in the grouped pass; categorization reuses them
+        for metric in ('sse_rap', 'sse_logistic'):
+            if metric in stats:
+                convergers.attrs[f'median_{metric}'] = float(stats[metric]['conv_median'])
+        
+        # Categorize outliers
+        categories = categorize_outliers(outliers, convergers)
+        
+        save_cached_analysis(RESULTS_FILE, outliers, convergers, categories, stats, max_sse, n_total)
     
     # Create visualizations
-    output_dir = Path(__file__).parent.parent / "results" / "raw" / "outlier_analysis"
-    create_visualizations(df, outliers, convergers, output_dir)
+    output_dir = OUTPUT_DIR
+    create_visualizations(max_sse, outliers, convergers, output_dir)
     
     # Generate report
     report_file = output_dir / "OUTLIER_ANALYSIS_REPORT.md"
-    generate_report(df, outliers, convergers, categories, stats, report_file)
+    generate_report(n_total, outliers, convergers, categories, stats, report_file)
     
     print(f"\n{'='*70}")
     print("✅ OUTLIER ANALYSIS COMPLETE!")
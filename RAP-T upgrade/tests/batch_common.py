@@ -0,0 +1,96 @@
+"""
+Shared Batch Fitting
+====================
+
+Per-curve fit, result schema and background loader used by the E. coli
+batch runs (test_full_scale.py and test_real_ecoli.py).
+"""
+
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+
+from core.fitting import fit_rap_curve
+
+# Curves handed to a worker per round trip
+FIT_CHUNK_SIZE = 32
+
+# Curves with fewer non-NaN points than this are not fitted
+MIN_POINTS = 10
+
+# Output columns and their dtypes; results are written into preallocated
+# arrays of these types rather than collected as a list of dicts
+RESULT_DTYPES = {
+    'curve': object,
+    'final_util': np.float64,
+    'distance_85': np.float64,
+    'converged_85': np.bool_,
+    'converged_100': np.bool_,
+    'sse_rap': np.float64,
+    'sse_logistic': np.float64,
+    'rap_better': np.bool_,
+    'r': np.float64,
+    'd': np.float64,
+    'K': np.float64,
+}
+
+
+def fit_one(task):
+    """
+    Pool worker: fit one curve.
+    
+    Parameters:
+    -----------
+    task : tuple
+        (curve_name, time_data, od_data), already NaN-free
+    
+    Returns:
+    --------
+    tuple
+        (result row, None) on success, (None, failure row) otherwise
+    """
+    curve_name, clean_time, clean_od = task
+    
+    try:
+        # Fit RAP
+        result = fit_rap_curve(
+            clean_time,
+            clean_od,
+            curve_name=curve_name,
+            verbose=False
+        )
+        
+        if not result['success']:
+            return None, {'curve': curve_name, 'reason': result.get('error', 'Unknown')}
+        
+        return {
+            'curve': result['curve'],
+            'final_util': result['final_util'],
+            'distance_85': result['distance'],
+            'converged_85': result['converged'],
+            'converged_100': result.get('converged_100', False),
+            'sse_rap': result['sse_rap'],
+            'sse_logistic': result['sse_logistic'],
+            'rap_better': result['rap_better'],
+            'r': result['r'],
+            'd': result['d'],
+            'K': result['K']
+        }, None
+    
+    except Exception as e:
+        return None, {'curve': curve_name, 'reason': str(e)}
+
+
+def in_background(fn, **kwargs):
+    """Start fn(**kwargs) on a daemon thread and return a Future for its result."""
+    future = Future()
+    
+    def run():
+        try:
+            future.set_result(fn(**kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+    
+    threading.Thread(target=run, daemon=True).start()
+    return future
@@ -9,6 +9,33 @@ import os
 import shutil
 from pathlib import Path
 
+
+def fast_copy(src, dst):
+    """
+    Copy a file in-kernel with os.copy_file_range where available.
+    
+    On Linux this avoids user-space buffers entirely and can reflink on
+    XFS/Btrfs. Elsewhere, or if the kernel refuses (e.g. across
+    filesystems on older kernels), falls back to shutil.copy2.
+    Metadata is preserved either way.
+    """
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(src, dst)
+                return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
 # Paths
 project_root = Path(__file__).parent.parent
 results_raw = project_root / "results" / "raw"
@@ -30,14 +57,25 @@ main_files = [
     "real_ecoli_round5_summary.png",
 ]
 
+# List results/raw once; lookups below are in-memory instead of a stat per file
+entries = {}
+if results_raw.is_dir():
+    with os.scandir(results_raw) as it:
+        entries = {e.name: e for e in it if e.is_file()}
+
 print(f"\nCopying files from results/raw/...")
 moved = 0
 
 for filename in main_files:
-    src = results_raw / filename
-    if src.exists():
+    # Full-scale results written after the Parquet switch use a .parquet suffix
+    if filename not in entries and filename.endswith(".csv"):
+        parquet_name = filename[:-len(".csv")] + ".parquet"
+        if parquet_name in entries:
+            filename = parquet_name
+    
+    if filename in entries:
         dst = new_folder / filename
-        shutil.copy2(src, dst)
+        fast_copy(entries[filename].path, dst)
         print(f"  ✅ {filename}")
         moved += 1
     else:
@@ -45,10 +83,12 @@ for filename in main_files:
 
 # Copy all progress files
 print(f"\nCopying progress logs...")
-for prog_file in results_raw.glob("full_scale_progress_*.csv"):
-    dst = new_folder / prog_file.name
-    shutil.copy2(prog_file, dst)
-    print(f"  ✅ {prog_file.name}")
+for name in sorted(entries):
+    if not (name.startswith("full_scale_progress") and name.endswith((".csv", ".ndjson"))):
+        continue
+    dst = new_folder / name
+    fast_copy(entries[name].path, dst)
+    print(f"  ✅ {name}")
     moved += 1
 
 # Create README
@@ -15,14 +15,15 @@ trajectory = rap_model_smooth(
 )
 
 final_util = trajectory[-1] / 3.0
+distance = abs(final_util - 0.85)
 print(f"Test with d=3.5:")
 print(f"  Final utilization: {final_util:.3f}")
 print(f"  Target: 0.850")
-print(f"  Distance: {abs(final_util - 0.85):.3f}")
-print(f"  Converged: {'YES' if abs(final_util - 0.85) < 0.05 else 'NO'}")
+print(f"  Distance: {distance:.3f}")
+print(f"  Converged: {'YES' if distance < 0.05 else 'NO'}")
 
-# Test trajectory at different points
+# Test trajectory at different points (gathered in one indexing step)
 print(f"\nTrajectory samples:")
-for i in [25, 50, 75, 99]:
-    util = trajectory[i] / 3.0
-    print(f"  t={time[i]:.1f}: util={util:.3f}")
+sample_idx = np.array([25, 50, 75, 99])
+for t, util in zip(time[sample_idx], trajectory[sample_idx] / 3.0):
+    print(f"  t={t:.1f}: util={util:.3f}")
@@ -12,22 +12,41 @@ Date: November 2, 2025
 
 import sys
 import os
+import json
+import time
+from pathlib import Path
 
 # Add project root to path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, project_root)
 
+# Progress log, results and plots all land here
+OUTPUT_DIR = Path(project_root) / 'results' / 'raw'
+
 import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # the summary figure is only saved to disk, never shown
 import matplotlib.pyplot as plt
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 
 # Now import project modules
 from datasets.biological.load_real_ecoli import load_aida_ecoli_data
-from core.fitting import fit_rap_curve
+from core.fitting import warm_up_worker
+from core.automated_processor import default_n_workers
+from batch_common import FIT_CHUNK_SIZE, MIN_POINTS, RESULT_DTYPES, fit_one, in_background
+
+# Seconds between progress-line refreshes
+PROGRESS_INTERVAL = 2.0
+
+
+def _json_scalar(value):
+    """json.dumps fallback for numpy scalars (np.bool_, np.float32, ...)."""
+    return value.item()
 
 
-def full_scale_rap_test(max_curves=None, save_interval=100):
+def full_scale_rap_test(max_curves=None, save_interval=100, n_workers=None, save_plots=True):
     """
     Run RAP detection on ALL E. coli curves (or up to max_curves).
     
@@ -36,10 +55,16 @@ def full_scale_rap_test(max_curves=None, save_interval=100):
     max_curves : int, optional
         Maximum curves to process (None = all available)
     save_interval : int
-        Save progress every N curves
+        Flush the progress log every N curves
+    n_workers : int, optional
+        Worker processes for the curve fits (None = available CPUs - 1)
+    save_plots : bool
+        Render the summary figure (default: True); False skips matplotlib
+        entirely for headless batch runs
     """
     
-    start_time = datetime.now()
+    start_time = datetime.now()  # wall-clock stamp for the header only
+    start_perf = time.perf_counter()
     
     print("\n" + "="*70)
     print("🚀 FULL SCALE RAP VALIDATION")
@@ -54,201 +79,232 @@ def full_scale_rap_test(max_curves=None, save_interval=100):
     else:
         print(f"\n🎯 Processing ALL curves (this will take a while!)")
     
-    input("\nPress Enter to start the BIG RUN...")
-    
-    # Load ALL data (no max_curves limit initially)
+    # Load ALL data (no max_curves limit initially) while the prompt waits
     print("\n📊 Loading E. coli data from all rounds...")
-    data = load_aida_ecoli_data(
+    pending = in_background(
+        load_aida_ecoli_data,
         data_dir=os.path.join(project_root, 'datasets', 'biological', 'ecoli_data'),
         max_curves=max_curves,
         rounds=None  # ALL rounds
     )
     
+    input("\nPress Enter to start the BIG RUN...")
+    data = pending.result()
+    
     time_data = data['time']
     curves = data['curves']
     
     total_curves = len(curves)
     print(f"\n✅ Loaded {total_curves} curves")
     print(f"   Time points per curve: {len(time_data)}")
-    print(f"   Estimated time: {total_curves * 2 / 60:.1f} minutes")
     
-    # Fit RAP to each curve
+    if n_workers is None:
+        n_workers = default_n_workers()
+    print(f"   Estimated time: {total_curves * 2 / 60 / n_workers:.1f} minutes ({n_workers} workers)")
+    
+    # Fit RAP to each curve; curves are independent, so they are fanned out
+    # to a process pool and collected back in input order
     print(f"\n🔬 Starting RAP detection...")
     print("="*70)
     
-    results = []
+    cols = {name: np.empty(total_curves, dtype=dtype) for name, dtype in RESULT_DTYPES.items()}
+    ok = np.zeros(total_curves, dtype=np.bool_)
+    n_ok = 0
     failed = []
     
-    for i, (curve_name, od_data) in enumerate(curves.items(), 1):
-        # Progress indicator every 10 curves
-        if i % 10 == 0 or i == 1:
-            elapsed = (datetime.now() - start_time).total_seconds()
-            rate = i / elapsed if elapsed > 0 else 0
-            eta_seconds = (total_curves - i) / rate if rate > 0 else 0
-            eta_minutes = eta_seconds / 60
-            
-            print(f"  [{i}/{total_curves}] ({i/total_curves*100:.1f}%) "
-                  f"Rate: {rate:.1f} curves/sec, ETA: {eta_minutes:.1f} min", end="\r")
+    # Clean every curve in one vectorized pass: the non-NaN points of all
+    # curves are packed back to back (CSR-style), so each curve is a slice
+    names = list(curves)
+    od_matrix = np.vstack([np.asarray(od, dtype=np.float64) for od in curves.values()])
+    valid = ~np.isnan(od_matrix)
+    counts = valid.sum(axis=1)
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    od_flat = od_matrix[valid]
+    time_flat = np.broadcast_to(np.asarray(time_data, dtype=np.float64), od_matrix.shape)[valid]
+    del od_matrix, valid
+    fittable = counts >= MIN_POINTS
+    
+    tasks = [(names[k], time_flat[offsets[k]:offsets[k + 1]], od_flat[offsets[k]:offsets[k + 1]])
+             for k in np.flatnonzero(fittable)]
+    
+    # Successful fits are appended to one NDJSON progress log as they arrive
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    progress_path = OUTPUT_DIR / 'full_scale_progress.ndjson'
+    
+    # Each worker warms up its fit kernels once, before taking any task
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=warm_up_worker) as executor, \
+         open(progress_path, 'w', buffering=1 << 20) as progress_fp:
+        fits = executor.map(fit_one, tasks, chunksize=FIT_CHUNK_SIZE)
         
-        try:
-            # Clean data
-            valid_mask = ~np.isnan(od_data)
-            if not np.any(valid_mask):
-                failed.append({'curve': curve_name, 'reason': 'All NaN'})
-                continue
-            
-            clean_time = time_data[valid_mask]
-            clean_od = od_data[valid_mask]
-            
-            if len(clean_time) < 10:
-                failed.append({'curve': curve_name, 'reason': f'Too few points ({len(clean_time)})'})
-                continue
+        # Progress line, refreshed on the first curve, every PROGRESS_INTERVAL
+        # seconds and on the last curve
+        progress_line = "  [{}/" + str(total_curves) + "] ({:.1f}%) Rate: {:.1f} curves/sec, ETA: {:.1f} min"
+        last_print = -PROGRESS_INTERVAL
+        
+        for i, curve_name in enumerate(names, 1):
+            now = time.perf_counter()
+            if now - last_print >= PROGRESS_INTERVAL or i == total_curves:
+                last_print = now
+                elapsed = now - start_perf
+                rate = i / elapsed if elapsed > 0 else 0
+                eta_seconds = (total_curves - i) / rate if rate > 0 else 0
+                eta_minutes = eta_seconds / 60
+                
+                print(progress_line.format(i, i / total_curves * 100, rate, eta_minutes),
+                      end="\r", flush=True)
             
-            # Fit RAP
-            result = fit_rap_curve(
-                clean_time,
-                clean_od,
-                curve_name=curve_name,
-                verbose=False
-            )
+            if fittable[i - 1]:
+                row, failure = next(fits)
+            elif counts[i - 1] == 0:
+                row, failure = None, {'curve': curve_name, 'reason': 'All NaN'}
+            else:
+                row, failure = None, {'curve': curve_name, 'reason': 'Too few points'}
             
-            if result['success']:
-                results.append({
-                    'curve': result['curve'],
-                    'final_util': result['final_util'],
-                    'distance_85': result['distance'],
-                    'converged_85': result['converged'],
-                    'converged_100': result.get('converged_100', False),
-                    'sse_rap': result['sse_rap'],
-                    'sse_logistic': result['sse_logistic'],
-                    'rap_better': result['rap_better'],
-                    'r': result['r'],
-                    'd': result['d'],
-                    'K': result['K']
-                })
+            if row is not None:
+                for name, value in row.items():
+                    cols[name][i - 1] = value
+                ok[i - 1] = True
+                n_ok += 1
+                progress_fp.write(json.dumps(row, default=_json_scalar) + '\n')
             else:
-                failed.append({'curve': curve_name, 'reason': result.get('error', 'Unknown')})
-        
-        except Exception as e:
-            failed.append({'curve': curve_name, 'reason': str(e)})
-        
-        # Save progress periodically
-        if i % save_interval == 0 and len(results) > 0:
-            temp_df = pd.DataFrame(results)
-            output_dir = os.path.join(project_root, 'results', 'raw')
-            os.makedirs(output_dir, exist_ok=True)
-            temp_path = os.path.join(output_dir, f'full_scale_progress_{i}.csv')
-            temp_df.to_csv(temp_path, index=False)
+                # The point count lives in its own column so 'reason' keeps
+                # only a handful of distinct values
+                failure['n_points'] = int(counts[i - 1])
+                failed.append(failure)
+            
+            # Push the buffered log to disk periodically
+            if i % save_interval == 0:
+                progress_fp.flush()
     
     print("\n" + "="*70)
     
     # Final statistics
-    end_time = datetime.now()
-    duration = (end_time - start_time).total_seconds()
+    duration = time.perf_counter() - start_perf
     
     print(f"\n⏱️  Processing complete!")
     print(f"   Duration: {duration/60:.1f} minutes ({duration:.0f} seconds)")
     print(f"   Rate: {total_curves/duration:.2f} curves/second")
     
-    if len(results) == 0:
+    if n_ok == 0:
         print("\n❌ No successful fits!")
         return None
     
     # Convert to DataFrame
-    df = pd.DataFrame(results)
+    df = pd.DataFrame({name: col[ok] for name, col in cols.items()})
     
-    print(f"\n" + "="*70)
-    print("📊 FULL SCALE RESULTS")
-    print("="*70)
+    # Results summary, collected and written to stdout in one call
+    lines = []
+    lines.append(f"\n" + "="*70)
+    lines.append("📊 FULL SCALE RESULTS")
+    lines.append("="*70)
     
     # Statistics
-    print(f"\n✅ Success Rate:")
-    print(f"   Successful: {len(results)}/{total_curves} ({len(results)/total_curves*100:.1f}%)")
-    print(f"   Failed: {len(failed)}/{total_curves} ({len(failed)/total_curves*100:.1f}%)")
-    
-    print(f"\n🎯 Convergence Analysis:")
-    n_conv_85 = df['converged_85'].sum()
-    n_conv_100 = df['converged_100'].sum()
-    print(f"   Converged to 85%:  {n_conv_85}/{len(df)} ({n_conv_85/len(df)*100:.1f}%)")
-    print(f"   Converged to 100%: {n_conv_100}/{len(df)} ({n_conv_100/len(df)*100:.1f}%)")
-    
-    print(f"\n📏 Utilization Statistics:")
-    print(f"   Mean final util:   {df['final_util'].mean():.3f} ± {df['final_util'].std():.3f}")
-    print(f"   Median:            {df['final_util'].median():.3f}")
-    print(f"   Range:             {df['final_util'].min():.3f} - {df['final_util'].max():.3f}")
-    print(f"   Target:            0.850 (85%)")
-    print(f"   Mean dist from 85%: {df['distance_85'].mean():.3f}")
-    
-    print(f"\n🏆 Model Comparison:")
-    n_rap_better = df['rap_better'].sum()
-    print(f"   RAP superior:      {n_rap_better}/{len(df)} ({n_rap_better/len(df)*100:.1f}%)")
-    print(f"   Mean SSE (RAP):    {df['sse_rap'].mean():.3f}")
-    print(f"   Mean SSE (Logistic): {df['sse_logistic'].mean():.3f}")
-    print(f"   Mean improvement:  {((df['sse_logistic'].mean() - df['sse_rap'].mean()) / df['sse_logistic'].mean() * 100):.1f}%")
-    
-    print(f"\n🔧 Parameter Estimates:")
-    print(f"   Growth rate (r):   {df['r'].mean():.3f} ± {df['r'].std():.3f}")
-    print(f"   Snap damping (d):  {df['d'].mean():.3f} ± {df['d'].std():.3f}")
-    print(f"   Carrying cap (K):  {df['K'].mean():.3f} ± {df['K'].std():.3f}")
+    lines.append(f"\n✅ Success Rate:")
+    lines.append(f"   Successful: {n_ok}/{total_curves} ({n_ok/total_curves*100:.1f}%)")
+    lines.append(f"   Failed: {len(failed)}/{total_curves} ({len(failed)/total_curves*100:.1f}%)")
+    
+    # Summary statistics come from one aggregation pass; the flag counts
+    # read the typed bool columns directly
+    stats = df[['final_util', 'distance_85', 'sse_rap', 'sse_logistic', 'r', 'd', 'K']].agg(
+        ['mean', 'std', 'median', 'min', 'max'])
+    flags = {name: np.count_nonzero(cols[name][ok])
+             for name in ('converged_85', 'converged_100', 'rap_better')}
+    
+    lines.append(f"\n🎯 Convergence Analysis:")
+    n_conv_85 = flags['converged_85']
+    n_conv_100 = flags['converged_100']
+    lines.append(f"   Converged to 85%:  {n_conv_85}/{len(df)} ({n_conv_85/len(df)*100:.1f}%)")
+    lines.append(f"   Converged to 100%: {n_conv_100}/{len(df)} ({n_conv_100/len(df)*100:.1f}%)")
+    
+    lines.append(f"\n📏 Utilization Statistics:")
+    lines.append(f"   Mean final util:   {stats.at['mean', 'final_util']:.3f} ± {stats.at['std', 'final_util']:.3f}")
+    lines.append(f"   Median:            {stats.at['median', 'final_util']:.3f}")
+    lines.append(f"   Range:             {stats.at['min', 'final_util']:.3f} - {stats.at['max', 'final_util']:.3f}")
+    lines.append(f"   Target:            0.850 (85%)")
+    lines.append(f"   Mean dist from 85%: {stats.at['mean', 'distance_85']:.3f}")
+    
+    lines.append(f"\n🏆 Model Comparison:")
+    n_rap_better = flags['rap_better']
+    mean_sse_rap = stats.at['mean', 'sse_rap']
+    mean_sse_log = stats.at['mean', 'sse_logistic']
+    lines.append(f"   RAP superior:      {n_rap_better}/{len(df)} ({n_rap_better/len(df)*100:.1f}%)")
+    lines.append(f"   Mean SSE (RAP):    {mean_sse_rap:.3f}")
+    lines.append(f"   Mean SSE (Logistic): {mean_sse_log:.3f}")
+    lines.append(f"   Mean improvement:  {((mean_sse_log - mean_sse_rap) / mean_sse_log * 100):.1f}%")
+    
+    lines.append(f"\n🔧 Parameter Estimates:")
+    lines.append(f"   Growth rate (r):   {stats.at['mean', 'r']:.3f} ± {stats.at['std', 'r']:.3f}")
+    lines.append(f"   Snap damping (d):  {stats.at['mean', 'd']:.3f} ± {stats.at['std', 'd']:.3f}")
+    lines.append(f"   Carrying cap (K):  {stats.at['mean', 'K']:.3f} ± {stats.at['std', 'K']:.3f}")
     
     # Distribution
-    print(f"\n📊 Final Utilization Distribution:")
+    lines.append(f"\n📊 Final Utilization Distribution:")
     bins = [0.0, 0.5, 0.7, 0.8, 0.85, 0.9, 0.95, 1.0, 1.1]
-    for i in range(len(bins)-1):
-        count = ((df['final_util'] >= bins[i]) & (df['final_util'] < bins[i+1])).sum()
+    counts, _ = np.histogram(df['final_util'].to_numpy(), bins=bins)
+    for lo, hi, count in zip(bins[:-1], bins[1:], counts):
         if count > 0:
             pct = count / len(df) * 100
             bar = '█' * int(pct / 2)
-            print(f"   {bins[i]:.2f}-{bins[i+1]:.2f}: {count:5d} ({pct:5.1f}%) {bar}")
+            lines.append(f"   {lo:.2f}-{hi:.2f}: {count:5d} ({pct:5.1f}%) {bar}")
+    sys.stdout.write("\n".join(lines) + "\n")
     
-    # Save final results
-    output_dir = os.path.join(project_root, 'results', 'raw')
-    os.makedirs(output_dir, exist_ok=True)
-    
-    output_path = os.path.join(output_dir, f'full_scale_rap_results_n{len(df)}.csv')
-    df.to_csv(output_path, index=False)
+    # Save final results (OUTPUT_DIR was created for the progress log) as
+    # zstd Parquet: typed columns, no float-to-text round trip
+    output_path = OUTPUT_DIR / f'full_scale_rap_results_n{len(df)}.parquet'
+    df.to_parquet(output_path, index=False, compression='zstd')
     print(f"\n💾 Results saved to: {output_path}")
     
     # Save failed curves
     if len(failed) > 0:
         failed_df = pd.DataFrame(failed)
-        failed_path = os.path.join(output_dir, f'full_scale_failed_n{len(failed)}.csv')
-        failed_df.to_csv(failed_path, index=False)
+        failed_df['reason'] = pd.Categorical(failed_df['reason'])
+        failed_path = OUTPUT_DIR / f'full_scale_failed_n{len(failed)}.parquet'
+        failed_df.to_parquet(failed_path, index=False, compression='zstd')
         print(f"💾 Failed curves saved to: {failed_path}")
     
     # Generate summary plots
-    print(f"\n📈 Generating summary plots...")
-    create_full_scale_plots(df, len(results), total_curves)
+    if save_plots:
+        print(f"\n📈 Generating summary plots...")
+        create_full_scale_plots(df, n_ok, total_curves)
     
-    # Final assessment
-    print("\n" + "="*70)
-    print("🎯 FINAL ASSESSMENT")
-    print("="*70)
+    # Final assessment, also written in one call
+    lines = []
+    lines.append("\n" + "="*70)
+    lines.append("🎯 FINAL ASSESSMENT")
+    lines.append("="*70)
     
     rap_detection_rate = n_conv_85 / len(df) * 100
     
     if rap_detection_rate > 70:
-        print(f"✅ STRONG RAP SIGNATURE!")
-        print(f"   {rap_detection_rate:.1f}% converged to 85%")
+        lines.append(f"✅ STRONG RAP SIGNATURE!")
+        lines.append(f"   {rap_detection_rate:.1f}% converged to 85%")
     elif rap_detection_rate > 40:
-        print(f"✅ MODERATE RAP SIGNATURE")
-        print(f"   {rap_detection_rate:.1f}% converged to 85%")
+        lines.append(f"✅ MODERATE RAP SIGNATURE")
+        lines.append(f"   {rap_detection_rate:.1f}% converged to 85%")
     elif rap_detection_rate > 20:
-        print(f"⚠️  WEAK RAP SIGNATURE")
-        print(f"   {rap_detection_rate:.1f}% converged to 85%")
+        lines.append(f"⚠️  WEAK RAP SIGNATURE")
+        lines.append(f"   {rap_detection_rate:.1f}% converged to 85%")
     else:
-        print(f"❌ MINIMAL RAP SIGNATURE")
-        print(f"   Only {rap_detection_rate:.1f}% converged to 85%")
+        lines.append(f"❌ MINIMAL RAP SIGNATURE")
+        lines.append(f"   Only {rap_detection_rate:.1f}% converged to 85%")
     
-    print(f"\n📊 Scale: Tested {len(results):,} curves")
-    print(f"⏱️  Duration: {duration/60:.1f} minutes")
-    print(f"🎯 Success rate: {len(results)/total_curves*100:.1f}%")
+    lines.append(f"\n📊 Scale: Tested {n_ok:,} curves")
+    lines.append(f"⏱️  Duration: {duration/60:.1f} minutes")
+    lines.append(f"🎯 Success rate: {n_ok/total_curves*100:.1f}%")
     
-    print("="*70)
+    lines.append("="*70)
+    sys.stdout.write("\n".join(lines) + "\n")
     
     return df
 
 
+def _hist_bars(ax, values, bins, **kwargs):
+    """Bin once with np.histogram and draw the counts as edge-aligned bars."""
+    values = np.asarray(values, dtype=np.float64)
+    counts, edges = np.histogram(values[np.isfinite(values)], bins=bins)
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', **kwargs)
+
+
 def create_full_scale_plots(df, n_success, n_total):
     """Create summary visualizations."""
     
@@ -256,7 +312,7 @@ def create_full_scale_plots(df, n_success, n_total):
     
     # Plot 1: Final utilization histogram
     ax = axes[0, 0]
-    ax.hist(df['final_util'], bins=50, alpha=0.7, color='steelblue', edgecolor='black')
+    _hist_bars(ax, df['final_util'], bins=50, alpha=0.7, color='steelblue', edgecolor='black')
     ax.axvline(0.85, color='red', linestyle='--', linewidth=2, label='85% Target')
     ax.axvline(1.0, color='orange', linestyle='--', linewidth=2, label='100% (K)')
     ax.set_xlabel('Final Utilization (P/K)', fontsize=12)
@@ -267,8 +323,8 @@ def create_full_scale_plots(df, n_success, n_total):
     
     # Plot 2: Convergence pie chart
     ax = axes[0, 1]
-    conv_85 = df['converged_85'].sum()
-    conv_100 = df['converged_100'].sum()
+    conv_85 = np.count_nonzero(df['converged_85'].to_numpy())
+    conv_100 = np.count_nonzero(df['converged_100'].to_numpy())
     neither = len(df) - conv_85 - conv_100
     
     sizes = [conv_85, conv_100, neither]
@@ -282,24 +338,27 @@ def create_full_scale_plots(df, n_success, n_total):
     
     # Plot 3: RAP vs Logistic SSE
     ax = axes[1, 0]
-    # Sample for visibility if too many points
-    if len(df) > 1000:
-        sample_df = df.sample(n=1000, random_state=42)
-    else:
-        sample_df = df
-    
-    ax.scatter(sample_df['sse_logistic'], sample_df['sse_rap'], alpha=0.4, s=20)
-    max_sse = max(sample_df['sse_logistic'].max(), sample_df['sse_rap'].max())
-    ax.plot([0, max_sse], [0, max_sse], 'r--', linewidth=2, label='Equal SSE')
+    # Hexagonal 2D histogram of every curve: cost depends on the grid, not on N
+    sse_log = df['sse_logistic'].to_numpy(dtype=np.float64)
+    sse_rap = df['sse_rap'].to_numpy(dtype=np.float64)
+    finite = np.isfinite(sse_log) & np.isfinite(sse_rap)
+    sse_log, sse_rap = sse_log[finite], sse_rap[finite]
+    
+    # No finite SSE pair (e.g. every fit failed) leaves the panel empty
+    if finite.any():
+        hb = ax.hexbin(sse_log, sse_rap, gridsize=60, bins='log', cmap='viridis', mincnt=1)
+        fig.colorbar(hb, ax=ax, label='Curves (log)')
+        max_sse = max(sse_log.max(), sse_rap.max())
+        ax.plot([0, max_sse], [0, max_sse], 'r--', linewidth=2, label='Equal SSE')
+        ax.legend(fontsize=10)
     ax.set_xlabel('Logistic SSE', fontsize=12)
     ax.set_ylabel('RAP SSE', fontsize=12)
     ax.set_title('Model Comparison', fontsize=14, fontweight='bold')
-    ax.legend(fontsize=10)
     ax.grid(alpha=0.3)
     
     # Plot 4: Parameter distribution (d)
     ax = axes[1, 1]
-    ax.hist(df['d'], bins=30, alpha=0.7, color='green', edgecolor='black')
+    _hist_bars(ax, df['d'], bins=30, alpha=0.7, color='green', edgecolor='black')
     ax.set_xlabel('Snap Damping (d)', fontsize=12)
     ax.set_ylabel('Count', fontsize=12)
     ax.set_title('Snap Damping Distribution', fontsize=14, fontweight='bold')
@@ -307,9 +366,8 @@ def create_full_scale_plots(df, n_success, n_total):
     
     plt.tight_layout()
     
-    output_dir = os.path.join(project_root, 'results', 'raw')
-    output_path = os.path.join(output_dir, f'full_scale_summary_n{len(df)}.png')
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    output_path = OUTPUT_DIR / f'full_scale_summary_n{len(df)}.png'
+    plt.savefig(output_path, dpi=150, bbox_inches='tight')
     print(f"   📊 Plot saved: {output_path}")
     plt.close()
 
@@ -12,21 +12,28 @@ Date: November 2025
 
 import sys
 import os
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
 # Add project root to path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, project_root)
 
+# Results table and summary plot both land here
+OUTPUT_DIR = Path(project_root) / 'results' / 'raw'
+
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
 # Now import project modules
 from datasets.biological.load_real_ecoli import load_aida_ecoli_data
-from core.fitting import fit_rap_curve
+from core.fitting import warm_up_worker
+from core.automated_processor import default_n_workers
+from batch_common import FIT_CHUNK_SIZE, MIN_POINTS, RESULT_DTYPES, fit_one, in_background
 
 
-def test_real_ecoli_rap(n_curves=50, rounds=[5]):
+def test_real_ecoli_rap(n_curves=50, rounds=[5], n_workers=None):
     """
     Run RAP detection on real E. coli data.
     
@@ -36,6 +43,8 @@ def test_real_ecoli_rap(n_curves=50, rounds=[5]):
         Number of curves to test
     rounds : list
         Which rounds to load (default: [5] - best data)
+    n_workers : int, optional
+        Worker processes for the curve fits (None = available CPUs - 1)
     """
     
     print("\n" + "="*70)
@@ -47,20 +56,22 @@ def test_real_ecoli_rap(n_curves=50, rounds=[5]):
     print(f"Target curves: {n_curves}")
     print("="*70)
     
-    input("\nPress Enter to start...")
-    
-    # Load real data
+    # Load real data while the prompt waits
     print("\n📊 Loading real E. coli data...")
     
     # Path to data from tests directory
     data_dir = os.path.join(project_root, 'datasets', 'biological', 'ecoli_data')
     
-    data = load_aida_ecoli_data(
+    pending = in_background(
+        load_aida_ecoli_data,
         data_dir=data_dir,
         max_curves=n_curves,
         rounds=rounds
     )
     
+    input("\nPress Enter to start...")
+    data = pending.result()
+    
     time_data = data['time']
     curves = data['curves']
     
@@ -72,111 +83,114 @@ def test_real_ecoli_rap(n_curves=50, rounds=[5]):
     print(f"\n🔬 Running RAP detection on {len(curves)} curves...")
     print("="*70)
     
-    results = []
-    
-    for i, (curve_name, od_data) in enumerate(curves.items(), 1):
-        print(f"  [{i}/{len(curves)}] {curve_name}...", end=" ")
+    # Names plus one (n_curves, n_time) matrix, so each curve is a contiguous row
+    curve_names = list(curves)
+    od_matrix = np.vstack([np.asarray(od, dtype=np.float64) for od in curves.values()])
+    n_total = len(curve_names)
+    cols = {name: np.empty(n_total, dtype=dtype) for name, dtype in RESULT_DTYPES.items()}
+    ok = np.zeros(n_total, dtype=np.bool_)
+    
+    # Clean data: drop NaN points; curves left with too few points are skipped
+    tasks = []
+    skipped = {}
+    for i in range(n_total):
+        od_data = od_matrix[i]
+        valid_mask = ~np.isnan(od_data)
+        n_valid = np.count_nonzero(valid_mask)
+        if n_valid == 0:
+            skipped[i] = "❌ All NaN"
+        elif n_valid < MIN_POINTS:
+            skipped[i] = f"❌ Too few points ({n_valid})"
+        else:
+            tasks.append((curve_names[i], time_data[valid_mask], od_data[valid_mask]))
+    
+    if n_workers is None:
+        n_workers = default_n_workers()
+    
+    # Curves are fitted in a process pool; map() yields in input order, so the
+    # per-curve status lines come out exactly as in a serial run
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=warm_up_worker) as executor:
+        fits = executor.map(fit_one, tasks, chunksize=FIT_CHUNK_SIZE)
         
-        try:
-            # Clean data: remove NaN values
-            valid_mask = ~np.isnan(od_data)
-            if not np.any(valid_mask):
-                print("❌ All NaN")
-                continue
+        for i in range(n_total):
+            print(f"  [{i + 1}/{n_total}] {curve_names[i]}...", end=" ")
             
-            # Get valid time and OD points
-            clean_time = time_data[valid_mask]
-            clean_od = od_data[valid_mask]
-            
-            # Need at least 10 points for fitting
-            if len(clean_time) < 10:
-                print(f"❌ Too few points ({len(clean_time)})")
+            if i in skipped:
+                print(skipped[i])
                 continue
             
-            result = fit_rap_curve(
-                clean_time,
-                clean_od,
-                curve_name=curve_name,
-                verbose=False  # Quiet mode for batch
-            )
+            row, failure = next(fits)
+            if row is None:
+                print(f"❌ {failure['reason']}")
+                continue
             
-            if result['success']:
-                print("✅")
-                results.append(result)
-            else:
-                print(f"❌ {result.get('error', 'Unknown error')}")
-        
-        except Exception as e:
-            print(f"❌ Exception: {e}")
+            print("✅")
+            for name in RESULT_DTYPES:
+                cols[name][i] = row[name]
+            ok[i] = True
     
     # Analyze results
     print("\n" + "="*70)
     print("📊 REAL E. COLI RESULTS")
     print("="*70)
     
-    if len(results) == 0:
+    n_ok = int(ok.sum())
+    if n_ok == 0:
         print("❌ No successful fits!")
         return None
     
     # Convert to DataFrame
-    df = pd.DataFrame([
-        {
-            'curve': r['curve'],
-            'final_util': r['final_util'],
-            'distance_85': r['distance'],
-            'converged_85': r['converged'],
-            'converged_100': r.get('converged_100', False),
-            'sse_rap': r['sse_rap'],
-            'sse_logistic': r['sse_logistic'],
-            'rap_better': r['rap_better'],
-            'r': r['r'],
-            'd': r['d'],
-            'K': r['K']
-        }
-        for r in results
-    ])
-    
-    # Statistics
-    print(f"\n✅ Success Rate:")
-    print(f"   Fits succeeded: {len(results)}/{len(curves)} ({len(results)/len(curves)*100:.1f}%)")
-    
-    print(f"\n🎯 Convergence Analysis:")
-    n_conv_85 = df['converged_85'].sum()
-    n_conv_100 = df['converged_100'].sum()
-    print(f"   Converged to 85%:  {n_conv_85}/{len(df)} ({n_conv_85/len(df)*100:.1f}%)")
-    print(f"   Converged to 100%: {n_conv_100}/{len(df)} ({n_conv_100/len(df)*100:.1f}%)")
-    
-    print(f"\n📏 Utilization Statistics:")
-    print(f"   Mean final util:   {df['final_util'].mean():.3f} ± {df['final_util'].std():.3f}")
-    print(f"   Range:             {df['final_util'].min():.3f} - {df['final_util'].max():.3f}")
-    print(f"   Target:            0.850 (85%)")
-    print(f"   Mean dist from 85%: {df['distance_85'].mean():.3f}")
-    
-    print(f"\n🏆 Model Comparison:")
-    n_rap_better = df['rap_better'].sum()
-    print(f"   RAP superior:      {n_rap_better}/{len(df)} ({n_rap_better/len(df)*100:.1f}%)")
-    print(f"   Mean SSE (RAP):    {df['sse_rap'].mean():.3f}")
-    print(f"   Mean SSE (Logistic): {df['sse_logistic'].mean():.3f}")
-    
-    print(f"\n🔧 Parameter Estimates:")
-    print(f"   Growth rate (r):   {df['r'].mean():.3f} ± {df['r'].std():.3f}")
-    print(f"   Snap damping (d):  {df['d'].mean():.3f} ± {df['d'].std():.3f}")
-    print(f"   Carrying cap (K):  {df['K'].mean():.3f} ± {df['K'].std():.3f}")
+    df = pd.DataFrame({name: col[ok] for name, col in cols.items()})
+    
+    # Statistics, collected and written to stdout in one call
+    lines = []
+    lines.append(f"\n✅ Success Rate:")
+    lines.append(f"   Fits succeeded: {n_ok}/{n_total} ({n_ok/n_total*100:.1f}%)")
+    
+    # Summary statistics come from one aggregation pass; the flag counts
+    # read the typed bool columns directly
+    stats = df[['final_util', 'distance_85', 'sse_rap', 'sse_logistic', 'r', 'd', 'K']].agg(
+        ['mean', 'std', 'min', 'max'])
+    flags = {name: np.count_nonzero(cols[name][ok])
+             for name in ('converged_85', 'converged_100', 'rap_better')}
+    
+    lines.append(f"\n🎯 Convergence Analysis:")
+    n_conv_85 = flags['converged_85']
+    n_conv_100 = flags['converged_100']
+    lines.append(f"   Converged to 85%:  {n_conv_85}/{len(df)} ({n_conv_85/len(df)*100:.1f}%)")
+    lines.append(f"   Converged to 100%: {n_conv_100}/{len(df)} ({n_conv_100/len(df)*100:.1f}%)")
+    
+    lines.append(f"\n📏 Utilization Statistics:")
+    lines.append(f"   Mean final util:   {stats.at['mean', 'final_util']:.3f} ± {stats.at['std', 'final_util']:.3f}")
+    lines.append(f"   Range:             {stats.at['min', 'final_util']:.3f} - {stats.at['max', 'final_util']:.3f}")
+    lines.append(f"   Target:            0.850 (85%)")
+    lines.append(f"   Mean dist from 85%: {stats.at['mean', 'distance_85']:.3f}")
+    
+    lines.append(f"\n🏆 Model Comparison:")
+    n_rap_better = flags['rap_better']
+    lines.append(f"   RAP superior:      {n_rap_better}/{len(df)} ({n_rap_better/len(df)*100:.1f}%)")
+    lines.append(f"   Mean SSE (RAP):    {stats.at['mean', 'sse_rap']:.3f}")
+    lines.append(f"   Mean SSE (Logistic): {stats.at['mean', 'sse_logistic']:.3f}")
+    
+    lines.append(f"\n🔧 Parameter Estimates:")
+    lines.append(f"   Growth rate (r):   {stats.at['mean', 'r']:.3f} ± {stats.at['std', 'r']:.3f}")
+    lines.append(f"   Snap damping (d):  {stats.at['mean', 'd']:.3f} ± {stats.at['std', 'd']:.3f}")
+    lines.append(f"   Carrying cap (K):  {stats.at['mean', 'K']:.3f} ± {stats.at['std', 'K']:.3f}")
     
     # Show distribution
-    print(f"\n📊 Final Utilization Distribution:")
+    lines.append(f"\n📊 Final Utilization Distribution:")
     bins = [0.0, 0.5, 0.7, 0.8, 0.85, 0.9, 0.95, 1.0, 1.1]
-    for i in range(len(bins)-1):
-        count = ((df['final_util'] >= bins[i]) & (df['final_util'] < bins[i+1])).sum()
+    counts, _ = np.histogram(df['final_util'].to_numpy(), bins=bins)
+    for lo, hi, count in zip(bins[:-1], bins[1:], counts):
         if count > 0:
             bar = '█' * int(count / len(df) * 50)
-            print(f"   {bins[i]:.2f}-{bins[i+1]:.2f}: {count:3d} {bar}")
+            lines.append(f"   {lo:.2f}-{hi:.2f}: {count:3d} {bar}")
+    sys.stdout.write("\n".join(lines) + "\n")
     
     # Save results
-    output_dir = os.path.join(project_root, 'results', 'raw')
-    os.makedirs(output_dir, exist_ok=True)
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     
-    output_path = os.path.join(output_dir, 'real_ecoli_rap_results.csv')
+    output_path = OUTPUT_DIR / 'real_ecoli_rap_results.csv'
     df.to_csv(output_path, index=False)
     print(f"\n💾 Results saved to: {output_path}")
     
@@ -184,32 +198,34 @@ def test_real_ecoli_rap(n_curves=50, rounds=[5]):
     print(f"\n📈 Generating summary plot...")
     create_summary_plot(df, rounds)
     
-    # Final assessment
-    print("\n" + "="*70)
-    print("🎯 ASSESSMENT")
-    print("="*70)
+    # Final assessment, written in one call
+    lines = []
+    lines.append("\n" + "="*70)
+    lines.append("🎯 ASSESSMENT")
+    lines.append("="*70)
     
     rap_detection_rate = n_conv_85 / len(df) * 100
     
     if rap_detection_rate > 50:
-        print(f"✅ STRONG RAP SIGNATURE DETECTED!")
-        print(f"   {rap_detection_rate:.1f}% of curves converged to 85% attractor")
+        lines.append(f"✅ STRONG RAP SIGNATURE DETECTED!")
+        lines.append(f"   {rap_detection_rate:.1f}% of curves converged to 85% attractor")
     elif rap_detection_rate > 20:
-        print(f"⚠️  MODERATE RAP SIGNATURE")
-        print(f"   {rap_detection_rate:.1f}% of curves show 85% convergence")
+        lines.append(f"⚠️  MODERATE RAP SIGNATURE")
+        lines.append(f"   {rap_detection_rate:.1f}% of curves show 85% convergence")
     else:
-        print(f"❌ WEAK RAP SIGNATURE")
-        print(f"   Only {rap_detection_rate:.1f}% converged to 85%")
+        lines.append(f"❌ WEAK RAP SIGNATURE")
+        lines.append(f"   Only {rap_detection_rate:.1f}% converged to 85%")
     
     if n_conv_100 > n_conv_85:
-        print(f"\n⚠️  NOTE: More curves converged to 100% ({n_conv_100}) than 85% ({n_conv_85})")
-        print(f"   This suggests logistic-like behavior in real data")
+        lines.append(f"\n⚠️  NOTE: More curves converged to 100% ({n_conv_100}) than 85% ({n_conv_85})")
+        lines.append(f"   This suggests logistic-like behavior in real data")
     
     if n_rap_better / len(df) > 0.7:
-        print(f"\n✅ RAP MODEL SUPERIOR!")
-        print(f"   RAP fits better than Logistic in {n_rap_better/len(df)*100:.1f}% of cases")
+        lines.append(f"\n✅ RAP MODEL SUPERIOR!")
+        lines.append(f"   RAP fits better than Logistic in {n_rap_better/len(df)*100:.1f}% of cases")
     
-    print("="*70)
+    lines.append("="*70)
+    sys.stdout.write("\n".join(lines) + "\n")
     
     return df
 
@@ -251,8 +267,8 @@ def create_summary_plot(df, rounds):
     
     # Plot 4: Convergence pie chart
     ax = axes[1, 1]
-    conv_85 = df['converged_85'].sum()
-    conv_100 = df['converged_100'].sum()
+    conv_85 = np.count_nonzero(df['converged_85'].to_numpy())
+    conv_100 = np.count_nonzero(df['converged_100'].to_numpy())
     neither = len(df) - conv_85 - conv_100
     
     sizes = [conv_85, conv_100, neither]
@@ -264,10 +280,8 @@ def create_summary_plot(df, rounds):
     
     plt.tight_layout()
     
-    output_dir = os.path.join(project_root, 'results', 'raw')
-    os.makedirs(output_dir, exist_ok=True)
-    
-    output_path = os.path.join(output_dir, f'real_ecoli_round{rounds[0]}_summary.png')
+    # OUTPUT_DIR was created when the results table was saved
+    output_path = OUTPUT_DIR / f'real_ecoli_round{rounds[0]}_summary.png'
     plt.savefig(output_path, dpi=150, bbox_inches='tight')
     print(f"   📊 Plot saved: {output_path}")
     plt.close()
@@ -9,15 +9,63 @@ Author: The Potato Researcher 🥔
 Date: November 2025
 """
 
+import os
+import sys
+
 import pandas as pd
 import numpy as np
 
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.rap_model import njit, prange
+from well10_common import load_hl60, DAMPING_PARAMS, FINAL_UTILS, PARAM_WELLS, DAMPING_VALS, UTIL_VALS
+
+
+@njit(parallel=True, cache=True)
+def _metrics(curves, dt):
+    """
+    Initial, final, maximum and early growth rate of each well in one pass.
+    
+    Parameters:
+    -----------
+    curves : ndarray
+        float64 array of shape (n_wells, n_time), one row per well
+    dt : float
+        Time between the first two points (hours)
+    
+    Returns:
+    --------
+    tuple
+        (initial, final, maximum, early_rate), each of shape (n_wells,)
+    """
+    n_wells, n_time = curves.shape
+    initial = np.empty(n_wells)
+    final = np.empty(n_wells)
+    maximum = np.empty(n_wells)
+    early_rate = np.zeros(n_wells)
+    
+    for j in prange(n_wells):
+        peak = curves[j, 0]
+        for i in range(1, n_time):
+            value = curves[j, i]
+            if value > peak or np.isnan(value):  # NaN propagates, as in np.max
+                peak = value
+        initial[j] = curves[j, 0]
+        final[j] = curves[j, n_time - 1]
+        maximum[j] = peak
+        if n_time > 1:
+            early_rate[j] = (curves[j, 1] - curves[j, 0]) / dt
+    
+    return initial, final, maximum, early_rate
+
+
 print("="*70)
 print("WELL 10 (Well_C8) DEEP DIVE ANALYSIS")
 print("="*70)
 
-# Load data
-df = pd.read_excel('datasets/cancer/hl60_processed.xlsx')
+# Load data (only the time axis and the well columns)
+df, wells = load_hl60()
 
 print("\n1. WELL 10 RAW DATA:")
 print("="*70)
@@ -25,43 +73,26 @@ print(df[['Time (h)', 'Well_C8']])
 
 # Calculate growth metrics for all wells
 time = df['Time (h)'].values
-wells = [col for col in df.columns if col.startswith('Well_')]
 
 print("\n2. GROWTH METRICS COMPARISON:")
 print("="*70)
 
-metrics = []
-for well in wells:
-    data = df[well].values
-    
-    # Calculate metrics
-    initial = data[0]
-    final = data[-1]
-    maximum = np.max(data)
-    growth_ratio = final / initial
-    max_growth_ratio = maximum / initial
-    
-    # Growth rate (simple: change between first two points)
-    if len(data) > 1:
-        early_rate = (data[1] - data[0]) / 24  # per hour
-    else:
-        early_rate = 0
-    
-    # Did it plateau? (final < max)
-    plateaued = final < maximum * 0.95
-    
-    metrics.append({
-        'Well': well,
-        'Initial': initial,
-        'Maximum': maximum,
-        'Final': final,
-        'Growth_Ratio': growth_ratio,
-        'Max_Growth_Ratio': max_growth_ratio,
-        'Early_Rate': early_rate,
-        'Plateaued': plateaued
-    })
-
-metrics_df = pd.DataFrame(metrics)
+# All wells at once, one contiguous row per well
+curves = np.ascontiguousarray(df[wells].to_numpy(dtype=np.float64).T)
+
+# Growth rate (simple: change between first two points, per hour)
+initial, final, maximum, early_rate = _metrics(curves, 24.0)
+
+metrics_df = pd.DataFrame({
+    'Well': wells,
+    'Initial': initial,
+    'Maximum': maximum,
+    'Final': final,
+    'Growth_Ratio': final / initial,
+    'Max_Growth_Ratio': maximum / initial,
+    'Early_Rate': early_rate,
+    'Plateaued': final < maximum * 0.95  # did it plateau? (final < max)
+})
 
 # Highlight Well 10 (Well_C8)
 well10_idx = metrics_df[metrics_df['Well'] == 'Well_C8'].index[0]
@@ -108,24 +139,9 @@ print("\n" + "="*70)
 print("RAP PARAMETERS vs GROWTH METRICS:")
 print("="*70)
 
-# From your results
-damping_params = {
-    'Well_B4': 0.100, 'Well_B5': 0.100, 'Well_B6': 0.100, 'Well_B7': 0.244,
-    'Well_B8': 0.160, 'Well_C4': 0.172, 'Well_C5': 0.117, 'Well_C6': 0.168,
-    'Well_C7': 0.100, 'Well_C8': 5.000, 'Well_D4': 0.110, 'Well_D5': 0.139,
-    'Well_D6': 0.240, 'Well_D7': 0.100, 'Well_D8': 0.179
-}
-
-final_utils = {
-    'Well_B4': 0.906, 'Well_B5': 0.906, 'Well_B6': 0.943, 'Well_B7': 0.956,
-    'Well_B8': 0.932, 'Well_C4': 0.936, 'Well_C5': 0.915, 'Well_C6': 0.934,
-    'Well_C7': 0.907, 'Well_C8': 0.870, 'Well_D4': 0.913, 'Well_D5': 0.925,
-    'Well_D6': 0.955, 'Well_D7': 0.904, 'Well_D8': 0.938
-}
-
-# Add to metrics
-metrics_df['Damping'] = metrics_df['Well'].map(damping_params)
-metrics_df['Final_Util'] = metrics_df['Well'].map(final_utils)
+# Add to metrics (metrics_df rows are in wells order)
+metrics_df['Damping'] = np.fromiter((DAMPING_PARAMS.get(w, np.nan) for w in wells), dtype=np.float64, count=len(wells))
+metrics_df['Final_Util'] = np.fromiter((FINAL_UTILS.get(w, np.nan) for w in wells), dtype=np.float64, count=len(wells))
 
 print("\nWell 10 RAP Parameters:")
 print(f"  Damping (d):      5.000  (50x higher than typical 0.1)")
@@ -185,15 +201,10 @@ print("\n" + "="*70)
 print("CORRELATION CHECK:")
 print("="*70)
 
-# Calculate correlation between damping and final utilization
-damping_vals = [damping_params[w] for w in wells]
-util_vals = [final_utils[w] for w in wells]
-
-# Correlation (excluding Well 10's extreme d=5.0 which skews it)
-other_damping = [d for w, d in damping_params.items() if w != 'Well_C8']
-other_util = [u for w, u in final_utils.items() if w != 'Well_C8']
-
-corr_coefficient = np.corrcoef(other_damping, other_util)[0, 1]
+# Correlation between damping and final utilization
+# (excluding Well 10's extreme d=5.0 which skews it)
+others = PARAM_WELLS != 'Well_C8'
+corr_coefficient = np.corrcoef(DAMPING_VALS[others], UTIL_VALS[others])[0, 1]
 print(f"\nCorrelation (damping vs final_util) for other 14 wells: {corr_coefficient:.3f}")
 
 if abs(corr_coefficient) > 0.3:
@@ -0,0 +1,61 @@
+"""
+Well 10 Shared Data
+===================
+
+HL-60 plate loader and the per-well RAP fit results used by the Well 10
+analysis and visualization scripts.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+# Written by prep.py/prepare_cancer_data.py; relative to the project root
+DATA_PATH = 'datasets/cancer/hl60_processed.parquet'
+
+# RAP results
+DAMPING_PARAMS = {
+    'Well_B4': 0.100, 'Well_B5': 0.100, 'Well_B6': 0.100, 'Well_B7': 0.244,
+    'Well_B8': 0.160, 'Well_C4': 0.172, 'Well_C5': 0.117, 'Well_C6': 0.168,
+    'Well_C7': 0.100, 'Well_C8': 5.000, 'Well_D4': 0.110, 'Well_D5': 0.139,
+    'Well_D6': 0.240, 'Well_D7': 0.100, 'Well_D8': 0.179
+}
+
+FINAL_UTILS = {
+    'Well_B4': 0.906, 'Well_B5': 0.906, 'Well_B6': 0.943, 'Well_B7': 0.956,
+    'Well_B8': 0.932, 'Well_C4': 0.936, 'Well_C5': 0.915, 'Well_C6': 0.934,
+    'Well_C7': 0.907, 'Well_C8': 0.870, 'Well_D4': 0.913, 'Well_D5': 0.925,
+    'Well_D6': 0.955, 'Well_D7': 0.904, 'Well_D8': 0.938
+}
+
+# The same tables as aligned arrays, one (damping, util) pair per fitted well
+PARAM_WELLS = np.array(list(DAMPING_PARAMS))
+DAMPING_VALS = np.array([DAMPING_PARAMS[w] for w in PARAM_WELLS])
+UTIL_VALS = np.array([FINAL_UTILS[w] for w in PARAM_WELLS])
+
+
+@lru_cache(maxsize=1)
+def load_hl60(path=DATA_PATH):
+    """
+    Load the processed HL-60 plate (time axis and well columns only).
+    
+    The DataFrame is cached, so scripts run together in one session parse
+    the file once; treat it as read-only.
+    
+    Parameters:
+    -----------
+    path : str
+        Parquet file to read (default: DATA_PATH)
+    
+    Returns:
+    --------
+    tuple
+        (df, wells) with wells the Well_* column names in file order
+    """
+    columns = [col for col in pq.read_schema(path).names
+               if col == 'Time (h)' or col.startswith('Well_')]
+    df = pd.read_parquet(path, columns=columns)
+    wells = [col for col in df.columns if col.startswith('Well_')]
+    return df, wells
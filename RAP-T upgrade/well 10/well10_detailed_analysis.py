@@ -5,22 +5,26 @@ Well 10 Detailed Growth Dynamics Analysis
 Extract every possible insight from the 6 time points.
 """
 
-import pandas as pd
 import numpy as np
+from well10_common import load_hl60
 
 print("="*70)
 print("WELL 10 GROWTH DYNAMICS - COMPLETE BREAKDOWN")
 print("="*70)
 
-# Load data
-df = pd.read_excel('datasets/cancer/hl60_processed.xlsx')
+# Load data (only the time axis and the well columns)
+df, wells = load_hl60()
 
 time = df['Time (h)'].values
-wells = [col for col in df.columns if col.startswith('Well_')]
 
 # Focus on Well 10
 well10_data = df['Well_C8'].values
 
+# Step-to-step change, rate and % change between consecutive time points
+deltas = np.diff(well10_data)
+rates = deltas / np.diff(time)
+pcts = deltas / well10_data[:-1] * 100
+
 print("\n1. WELL 10 TIME-SERIES DATA:")
 print("="*70)
 
@@ -36,10 +40,9 @@ for i in range(len(time)):
         rate = 0
         phase = "Initial"
     else:
-        change = count - well10_data[i-1]
-        pct_change = (change / well10_data[i-1]) * 100
-        time_diff = time[i] - time[i-1]
-        rate = change / time_diff
+        change = deltas[i-1]
+        pct_change = pcts[i-1]
+        rate = rates[i-1]
         
         # Determine phase
         if change > 5000:
@@ -57,58 +60,26 @@ print("\n" + "="*70)
 print("2. GROWTH PHASE ANALYSIS:")
 print("="*70)
 
-# Phase 1: 0-24h
-phase1_growth = well10_data[1] - well10_data[0]
-phase1_rate = phase1_growth / 24
-phase1_pct = (phase1_growth / well10_data[0]) * 100
-
-print(f"\nPhase 1 (0-24h): EXPONENTIAL GROWTH")
-print(f"  Growth: {phase1_growth:,.0f} cells ({phase1_pct:.1f}%)")
-print(f"  Rate: {phase1_rate:.1f} cells/hour")
-print(f"  Interpretation: Healthy exponential phase")
-
-# Phase 2: 24-48h
-phase2_growth = well10_data[2] - well10_data[1]
-phase2_rate = phase2_growth / 24
-phase2_pct = (phase2_growth / well10_data[1]) * 100
-
-print(f"\nPhase 2 (24-48h): GROWTH SLOWDOWN")
-print(f"  Growth: {phase2_growth:,.0f} cells ({phase2_pct:.1f}%)")
-print(f"  Rate: {phase2_rate:.1f} cells/hour")
-print(f"  Deceleration: {((phase2_rate/phase1_rate - 1) * 100):.1f}%")
-print(f"  Interpretation: Growth rate dropped 80% - entering lag phase")
-
-# Phase 3: 48-72h
-phase3_growth = well10_data[3] - well10_data[2]
-phase3_rate = phase3_growth / 24
-phase3_pct = (phase3_growth / well10_data[2]) * 100
-
-print(f"\nPhase 3 (48-72h): LATE EXPONENTIAL")
-print(f"  Growth: {phase3_growth:,.0f} cells ({phase3_pct:.1f}%)")
-print(f"  Rate: {phase3_rate:.1f} cells/hour")
-print(f"  Interpretation: Second growth burst - utilizing remaining resources")
-
-# Phase 4: 72-96h
-phase4_growth = well10_data[4] - well10_data[3]
-phase4_rate = phase4_growth / 24
-phase4_pct = (phase4_growth / well10_data[3]) * 100
-
-print(f"\nPhase 4 (72-96h): FINAL GROWTH / PEAK")
-print(f"  Growth: {phase4_growth:,.0f} cells ({phase4_pct:.1f}%)")
-print(f"  Rate: {phase4_rate:.1f} cells/hour")
-print(f"  Peak density: {well10_data[4]:,.0f} cells")
-print(f"  Interpretation: Reached maximum capacity")
-
-# Phase 5: 96-120h
-phase5_growth = well10_data[5] - well10_data[4]
-phase5_rate = phase5_growth / 24
-phase5_pct = (phase5_growth / well10_data[4]) * 100
-
-print(f"\nPhase 5 (96-120h): 🔴 POPULATION CRASH")
-print(f"  Growth: {phase5_growth:,.0f} cells ({phase5_pct:.1f}%)")
-print(f"  Rate: {phase5_rate:.1f} cells/hour")
-print(f"  Cell loss: {abs(phase5_growth):,.0f} cells in 24h")
-print(f"  Interpretation: MASSIVE DIE-OFF")
+# (window, phase, interpretation) for each 24h step
+phases = [
+    ("0-24h", "EXPONENTIAL GROWTH", "Healthy exponential phase"),
+    ("24-48h", "GROWTH SLOWDOWN", "Growth rate dropped 80% - entering lag phase"),
+    ("48-72h", "LATE EXPONENTIAL", "Second growth burst - utilizing remaining resources"),
+    ("72-96h", "FINAL GROWTH / PEAK", "Reached maximum capacity"),
+    ("96-120h", "🔴 POPULATION CRASH", "MASSIVE DIE-OFF"),
+]
+
+for i, ((window, phase, interpretation), growth, rate, pct) in enumerate(zip(phases, deltas, rates, pcts)):
+    print(f"\nPhase {i + 1} ({window}): {phase}")
+    print(f"  Growth: {growth:,.0f} cells ({pct:.1f}%)")
+    print(f"  Rate: {rate:.1f} cells/hour")
+    if i == 1:
+        print(f"  Deceleration: {((rate/rates[0] - 1) * 100):.1f}%")
+    elif i == 3:
+        print(f"  Peak density: {well10_data[i + 1]:,.0f} cells")
+    elif i == 4:
+        print(f"  Cell loss: {abs(growth):,.0f} cells in 24h")
+    print(f"  Interpretation: {interpretation}")
 
 print("\n" + "="*70)
 print("3. COMPARISON WITH OTHER WELLS AT FINAL TIMEPOINT:")
@@ -118,22 +89,18 @@ print("="*70)
 print(f"\n{'Well':>10s} {'Peak':>12s} {'Final (120h)':>15s} {'Change':>12s} {'Status':>15s}")
 print("-"*70)
 
-for well in wells:
-    data = df[well].values
-    peak = np.max(data)
-    final = data[-1]
-    change = final - peak
-    pct = (change / peak) * 100
-    
-    if abs(pct) < 5:
-        status = "Stable"
-    elif pct < -10:
-        status = "🔴 Crashed"
-    elif pct > 0:
-        status = "Still growing"
-    else:
-        status = "Minor decline"
-    
+# Peak, final and % change for every well in one pass over the time x well array
+arr = df[wells].to_numpy()
+peaks = arr.max(axis=0)
+finals = arr[-1]
+pcts_final = (finals - peaks) / peaks * 100
+statuses = np.select(
+    [np.abs(pcts_final) < 5, pcts_final < -10, pcts_final > 0],
+    ["Stable", "🔴 Crashed", "Still growing"],
+    default="Minor decline"
+)
+
+for well, peak, final, pct, status in zip(wells, peaks, finals, pcts_final, statuses):
     marker = " ← WELL 10" if well == 'Well_C8' else ""
     print(f"{well:>10s} {peak:>12,.0f} {final:>15,.0f} {pct:>11.1f}% {status:>15s}{marker}")
 